@@ -0,0 +1,164 @@
+"""End-to-end load test of SVSDevice against simulated subwoofers.
+
+Run from the repository root, with the integration requirements installed:
+
+    python -m benchmarks.bench_load --subs 24 --commands 200 --latency 0.02
+
+Every subwoofer connects, reads its full settings and then runs a mix of
+reads, latest-wins writes and batched writes. Command round trips are
+reported as percentiles, along with failures, reconnects and notifications.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+from collections import defaultdict
+from collections.abc import Awaitable
+import logging
+from pathlib import Path
+import random
+import sys
+import time
+from typing import Any
+
+from bleak.exc import BleakError
+
+from custom_components.svs_subwoofer.device import SVSDevice
+
+from .bench_protocol import percentile
+from .simulator import LinkProfile, SimulatedSubwoofer
+
+
+class SubwooferLoad:
+    """Workload of one subwoofer and the round trips it measured."""
+
+    def __init__(self, profile: LinkProfile, seed: int) -> None:
+        """Initialize the simulated subwoofer and the device talking to it."""
+        self.subwoofer = SimulatedSubwoofer(profile)
+        self.device = SVSDevice(self.subwoofer.address, connector=self.subwoofer.connector())
+        self.random = random.Random(seed)
+        self.round_trips: dict[str, list[float]] = defaultdict(list)
+        self.failures = 0
+        self.reconnects = 0
+
+    async def _timed(self, name: str, command: Awaitable[Any]) -> None:
+        """Await a command and record its round trip."""
+        start = time.perf_counter()
+        try:
+            await command
+        except BleakError:
+            self.failures += 1
+        else:
+            self.round_trips[name].append((time.perf_counter() - start) * 1000)
+
+    async def _ensure_connected(self) -> None:
+        """Connect, counting reconnects after the first connection."""
+        if self.device.is_connected:
+            return
+        if self.subwoofer.client is not None:
+            self.reconnects += 1
+        await self.device.connect(self.subwoofer.ble_device)
+
+    async def run(self, commands: int) -> None:
+        """Connect, sync and then run the command mix."""
+        device = self.device
+        await self._ensure_connected()
+        await self._timed("full_settings", device.get_full_settings())
+        for _ in range(commands):
+            await self._ensure_connected()
+            choice = self.random.random()
+            if choice < 0.4:
+                await self._timed("read", device.read("VOLUME"))
+            elif choice < 0.8:
+                await self._timed(
+                    "write_latest", device.write_latest("VOLUME", self.random.randint(-60, 0))
+                )
+            elif choice < 0.95:
+                await self._timed(
+                    "set_many",
+                    device.set_many(
+                        {
+                            "VOLUME": self.random.randint(-60, 0),
+                            "PHASE": self.random.randint(0, 180),
+                            "POLARITY": self.random.randint(0, 1),
+                        }
+                    ),
+                )
+            else:
+                await self._timed("full_settings", device.get_full_settings(False))
+        await device.disconnect()
+
+
+async def run(args: argparse.Namespace) -> int:
+    """Run the load test and print the results."""
+    loads = [
+        SubwooferLoad(
+            LinkProfile(
+                latency=args.latency,
+                jitter=args.jitter,
+                mtu=args.mtu,
+                drop_rate=args.drop_rate,
+                disconnect_rate=args.disconnect_rate,
+                seed=args.seed + index,
+            ),
+            args.seed + index,
+        )
+        for index in range(args.subs)
+    ]
+
+    if args.capture:
+        loads[0].device.set_capture(True)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(load.run(args.commands) for load in loads))
+    elapsed = time.perf_counter() - start
+
+    round_trips: dict[str, list[float]] = defaultdict(list)
+    for load in loads:
+        for name, samples in load.round_trips.items():
+            round_trips[name].extend(samples)
+    completed = sum(len(samples) for samples in round_trips.values())
+
+    print(
+        f"{args.subs} subwoofers, {completed} commands in {elapsed:.2f} s "
+        f"({completed / elapsed:.0f} commands/s)"
+    )
+    print(f"{'command':<16}{'count':>8}{'p50 ms':>9}{'p90 ms':>9}{'p99 ms':>9}{'max ms':>9}")
+    for name, samples in sorted(round_trips.items()):
+        samples.sort()
+        print(
+            f"{name:<16}{len(samples):>8}{percentile(samples, 0.5):>9.1f}"
+            f"{percentile(samples, 0.9):>9.1f}{percentile(samples, 0.99):>9.1f}{samples[-1]:>9.1f}"
+        )
+    print(
+        f"failures {sum(load.failures for load in loads)}, "
+        f"reconnects {sum(load.reconnects for load in loads)}, "
+        f"notifications {sum(load.subwoofer.notifications_sent for load in loads)}, "
+        f"dropped {sum(load.subwoofer.notifications_dropped for load in loads)}"
+    )
+    if args.capture:
+        args.capture.write_bytes(loads[0].device.capture.export())
+        print(f"Capture of {loads[0].subwoofer.address} written to {args.capture}")
+    return 0
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Parse the arguments and run the load test."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--subs", type=int, default=24)
+    parser.add_argument("--commands", type=int, default=100, help="commands per subwoofer")
+    parser.add_argument("--latency", type=float, default=0.02, help="one way delay in s")
+    parser.add_argument("--jitter", type=float, default=0.005, help="extra random delay in s")
+    parser.add_argument("--mtu", type=int, default=23)
+    parser.add_argument("--drop-rate", type=float, default=0.0)
+    parser.add_argument("--disconnect-rate", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--capture", type=Path, help="write a capture of the first subwoofer")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.ERROR)
+    return asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
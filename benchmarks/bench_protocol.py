@@ -0,0 +1,311 @@
+"""Benchmarks for the SVS frame codec and notification reassembly.
+
+Run from the repository root, with the integration requirements installed:
+
+    python -m benchmarks.bench_protocol
+    python -m benchmarks.bench_protocol --update
+
+Every benchmark is compared with benchmarks/baselines.json. Throughput below
+the baseline by more than the tolerance, or more allocations per frame than
+the baseline, is reported as a regression and the run exits non-zero.
+
+Raw frames per second follow the speed the machine happens to run at, which
+on shared or power managed machines swings by 30 to 50 percent between runs.
+The comparison uses relative throughput instead: every timed repeat is
+bracketed by a fixed calibration workload, and the benchmark's speed is
+divided by the calibration speed measured around it. The median over the
+repeats is stored and compared. It still varies by up to about 10 percent
+between runs, the default tolerance of 25 percent leaves room for that.
+Record baselines with --update on the machine that runs the comparison.
+"""
+from __future__ import annotations
+
+import argparse
+from collections.abc import Callable, Sequence
+import gc
+import json
+import logging
+from pathlib import Path
+import platform
+import sys
+import time
+from typing import Any
+
+from custom_components.svs_subwoofer.device import SVSDevice
+from custom_components.svs_subwoofer.protocol import (
+    FrameReassembler,
+    _encode_memwrite,
+    svs_decode,
+    svs_decode_verified,
+    svs_encode,
+)
+
+from .corpus import Corpus, build_corpus
+
+BASELINES = Path(__file__).with_name("baselines.json")
+
+# Allowed relative drop in frames per second before a run fails
+DEFAULT_TOLERANCE = 0.25
+# Allowed increase in allocations per frame, they are deterministic
+ALLOCATION_TOLERANCE = 0.05
+# Timed repeats the rounds are split into, the median relative speed counts
+DEFAULT_REPEATS = 9
+# Input and passes of the calibration workload timed around every repeat
+_CALIBRATION_DATA = bytes(range(256)) * 8
+_CALIBRATION_PASSES = 20
+
+
+def calibration_speed() -> float:
+    """Return passes per second of a fixed workload of slicing, parsing and lookups."""
+    data = _CALIBRATION_DATA
+    table: dict[int, int] = {}
+    start = time.perf_counter()
+    for _ in range(_CALIBRATION_PASSES):
+        for position in range(0, len(data), 2):
+            word = int.from_bytes(data[position:position + 2], "little")
+            table[word] = table.get(word, 0) + 1
+    return _CALIBRATION_PASSES / (time.perf_counter() - start)
+
+
+class Benchmark:
+    """A named operation run over a list of inputs."""
+
+    def __init__(
+        self,
+        name: str,
+        inputs: Sequence[Any],
+        make_operation: Callable[[list[Any]], Callable[[Any], Any]],
+        frames: int | None = None,
+    ) -> None:
+        """Initialize the benchmark, frames defaults to one per input."""
+        self.name = name
+        self.inputs = inputs
+        # Called with a sink for results, returns the operation run per input
+        self.make_operation = make_operation
+        self.frames = len(inputs) if frames is None else frames
+
+    def throughput(self, rounds: int, repeats: int = 1) -> tuple[float, float]:
+        """Return the best frames per second and the median speed relative to calibration."""
+        operation = self.make_operation([])
+        inputs = self.inputs
+        passes = max(1, rounds // repeats)
+        best = 0.0
+        relative: list[float] = []
+        # Like timeit, keep collector pauses of earlier garbage out of the timing
+        gc.collect()
+        gc.disable()
+        try:
+            for _ in range(repeats):
+                before = calibration_speed()
+                start = time.perf_counter()
+                for _ in range(passes):
+                    for item in inputs:
+                        operation(item)
+                frames_per_sec = self.frames * passes / (time.perf_counter() - start)
+                calibration = (before + calibration_speed()) / 2
+                best = max(best, frames_per_sec)
+                relative.append(frames_per_sec / calibration)
+        finally:
+            gc.enable()
+        relative.sort()
+        return best, relative[len(relative) // 2]
+
+    def latencies(self, rounds: int) -> list[float]:
+        """Return the duration of every single operation in microseconds."""
+        operation = self.make_operation([])
+        perf_counter_ns = time.perf_counter_ns
+        samples: list[float] = []
+        for _ in range(rounds):
+            for item in self.inputs:
+                start = perf_counter_ns()
+                operation(item)
+                samples.append((perf_counter_ns() - start) / 1000)
+        return samples
+
+    def allocations(self) -> float:
+        """Return the memory blocks still allocated per frame after one pass."""
+        # Results are kept alive in the sink so they count as allocations
+        sink: list[Any] = []
+        operation = self.make_operation(sink)
+        # One-time growth of caches and counters is not a per frame cost
+        for item in self.inputs:
+            operation(item)
+        sink.clear()
+        gc.collect()
+        gc.disable()
+        try:
+            before = sys.getallocatedblocks()
+            for item in self.inputs:
+                operation(item)
+            blocks = sys.getallocatedblocks() - before
+        finally:
+            gc.enable()
+        return blocks / self.frames
+
+
+def percentile(samples: list[float], fraction: float) -> float:
+    """Return a percentile of already sorted samples."""
+    return samples[min(len(samples) - 1, int(fraction * len(samples)))]
+
+
+def build_benchmarks(corpus: Corpus) -> list[Benchmark]:
+    """Build every benchmark over the corpus."""
+
+    def encode(sink: list[Any]) -> Callable[[Any], Any]:
+        def operation(case: tuple[str, str, Any]) -> None:
+            sink.append(svs_encode(*case))
+        return operation
+
+    def encode_uncached(sink: list[Any]) -> Callable[[Any], Any]:
+        def operation(case: tuple[str, str, Any]) -> None:
+            _encode_memwrite.cache_clear()
+            sink.append(svs_encode(*case))
+        return operation
+
+    def decode(sink: list[Any]) -> Callable[[Any], Any]:
+        def operation(frame: bytes) -> None:
+            sink.append(svs_decode(frame))
+        return operation
+
+    def decode_verified(sink: list[Any]) -> Callable[[Any], Any]:
+        def operation(frame: bytes) -> None:
+            sink.append(svs_decode_verified(frame))
+        return operation
+
+    def reassemble(sink: list[Any]) -> Callable[[Any], Any]:
+        reassembler = FrameReassembler()
+
+        def operation(data: bytes) -> None:
+            sink.extend(reassembler.feed(data))
+        return operation
+
+    def notify(sink: list[Any]) -> Callable[[Any], Any]:
+        device = SVSDevice("00:00:00:00:00:00")
+        device.register_callback(sink.append)
+
+        def operation(data: bytes) -> None:
+            device._notification_handler(0, bytearray(data))
+        return operation
+
+    writes = [case for case in corpus.encode_cases if case[0] == "MEMWRITE"]
+    benchmarks = [
+        Benchmark("encode", corpus.encode_cases, encode),
+        Benchmark("encode_memwrite_uncached", writes, encode_uncached),
+        Benchmark("decode_valid", corpus.frames, decode),
+        Benchmark("decode_corrupted", corpus.corrupted, decode),
+        Benchmark("decode_verified", corpus.frames, decode_verified),
+    ]
+    for scenario, stream in corpus.streams.items():
+        benchmarks.append(
+            Benchmark(f"reassemble_{scenario}", stream, reassemble, len(corpus.frames))
+        )
+    for scenario, stream in corpus.streams.items():
+        benchmarks.append(
+            Benchmark(f"notify_{scenario}", stream, notify, len(corpus.frames))
+        )
+    return benchmarks
+
+
+def run(
+    benchmarks: list[Benchmark], rounds: int, repeats: int = DEFAULT_REPEATS
+) -> dict[str, dict[str, float]]:
+    """Run the benchmarks and return their results keyed on name."""
+    results: dict[str, dict[str, float]] = {}
+    for benchmark in benchmarks:
+        # Warm up caches before measuring
+        benchmark.throughput(1)
+        samples = sorted(benchmark.latencies(rounds))
+        frames_per_sec, relative = benchmark.throughput(rounds, repeats)
+        results[benchmark.name] = {
+            "frames_per_sec": round(frames_per_sec),
+            # Frames per calibration pass, what the comparison uses
+            "relative": round(relative, 2),
+            "allocations_per_frame": round(benchmark.allocations(), 2),
+            "p50_us": round(percentile(samples, 0.50), 2),
+            "p90_us": round(percentile(samples, 0.90), 2),
+            "p99_us": round(percentile(samples, 0.99), 2),
+        }
+    return results
+
+
+def compare(
+    results: dict[str, dict[str, float]],
+    baselines: dict[str, dict[str, float]],
+    tolerance: float,
+) -> list[str]:
+    """Return a line for every result that regressed against its baseline."""
+    regressions = []
+    for name, result in results.items():
+        baseline = baselines.get(name)
+        if baseline is None:
+            continue
+        if result["relative"] < baseline["relative"] * (1 - tolerance):
+            regressions.append(
+                f"{name}: {result['relative']} frames per calibration pass, "
+                f"baseline {baseline['relative']}"
+            )
+        allowed = baseline["allocations_per_frame"] * (1 + ALLOCATION_TOLERANCE) + 0.05
+        if result["allocations_per_frame"] > allowed:
+            regressions.append(
+                f"{name}: {result['allocations_per_frame']} allocations/frame, "
+                f"baseline {baseline['allocations_per_frame']}"
+            )
+    return regressions
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Run the benchmarks and compare them with the stored baselines."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rounds", type=int, default=200, help="passes over the corpus")
+    parser.add_argument(
+        "--repeats", type=int, default=DEFAULT_REPEATS,
+        help="timed repeats the rounds are split into, the median relative speed counts",
+    )
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE)
+    parser.add_argument("--update", action="store_true", help="store results as baselines")
+    parser.add_argument("--seed", type=int, default=0, help="corpus seed")
+    args = parser.parse_args(argv)
+
+    # Logging cost is the handler's, not the codec's
+    logging.disable(logging.CRITICAL)
+
+    corpus = build_corpus(args.seed)
+    results = run(build_benchmarks(corpus), args.rounds, args.repeats)
+
+    print(
+        f"{'benchmark':<28}{'frames/s':>12}{'relative':>10}{'allocs/frame':>14}"
+        f"{'p50 us':>9}{'p90 us':>9}{'p99 us':>9}"
+    )
+    for name, result in results.items():
+        print(
+            f"{name:<28}{result['frames_per_sec']:>12}{result['relative']:>10}"
+            f"{result['allocations_per_frame']:>14}"
+            f"{result['p50_us']:>9}{result['p90_us']:>9}{result['p99_us']:>9}"
+        )
+
+    machine = {"python": platform.python_version(), "machine": platform.machine()}
+    if args.update:
+        BASELINES.write_text(
+            json.dumps({"machine": machine, "results": results}, indent=2) + "\n"
+        )
+        print(f"Baselines written to {BASELINES}")
+        return 0
+
+    if not BASELINES.exists():
+        print("No baselines stored, run with --update to record them")
+        return 0
+    stored = json.loads(BASELINES.read_text())
+    if stored["machine"] != machine:
+        print(f"Baselines were recorded on {stored['machine']}, this is {machine}")
+
+    if regressions := compare(results, stored["results"], args.tolerance):
+        print("\nREGRESSIONS against stored baselines:")
+        for line in regressions:
+            print(f"  {line}")
+        return 1
+    print("\nNo regressions against stored baselines")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,145 @@
+"""Synthetic SVS frame corpus for the protocol benchmarks."""
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+import random
+from typing import Any
+
+from custom_components.svs_subwoofer.const import SVS_FRAME_TYPES
+from custom_components.svs_subwoofer.protocol import (
+    MAX_MEMORY_ID,
+    PARAMS,
+    READ_RESP_PREFIX_LENGTH,
+    SVSParam,
+    build_frame,
+    encode_value,
+)
+
+# Notification payload size with the default ATT MTU of 23
+DEFAULT_FRAGMENT_SIZE = 20
+
+# Bytes READ_RESP frames carry before the memory address
+READ_RESP_PREFIX = bytes(READ_RESP_PREFIX_LENGTH)
+
+
+@dataclass
+class Corpus:
+    """Frames and notification streams exercising every parameter and frame type."""
+
+    # (frame type, parameter, value) accepted by svs_encode
+    encode_cases: list[tuple[str, str, Any]] = field(default_factory=list)
+    # Complete frames as received from the device
+    frames: list[bytes] = field(default_factory=list)
+    # Frames with a flipped bit, a truncated tail or a wrong length
+    corrupted: list[bytes] = field(default_factory=list)
+    # Notification fragments per scenario, fed in order
+    streams: dict[str, list[bytes]] = field(default_factory=dict)
+
+    @property
+    def stream_frames(self) -> int:
+        """Return the number of valid frames across all streams."""
+        return len(self.frames) * len(self.streams)
+
+
+def sample_value(spec: SVSParam, rng: random.Random) -> Any:
+    """Return a random value within the limits of a parameter."""
+    if spec.limits_type == 2:
+        return spec.name[: spec.n_bytes].title()
+    if spec.limits_type == 1:
+        return rng.choice(sorted(spec.allowed))
+    return rng.choice(sorted(spec.words.values()))
+
+
+def memory_payload(spec: SVSParam, rng: random.Random) -> bytes:
+    """Return valid memory content for a parameter or a group of them."""
+    if not spec.is_group:
+        return encode_value(spec, sample_value(spec, rng))
+
+    content = bytearray(spec.n_bytes)
+    for member in PARAMS.values():
+        if (
+            member.is_group
+            or member.mem_id != spec.mem_id
+            or member.offset < spec.offset
+            or member.end > spec.end
+        ):
+            continue
+        start = member.offset - spec.offset
+        content[start:start + member.n_bytes] = memory_payload(member, rng)
+    return bytes(content)
+
+
+def read_response(spec: SVSParam, rng: random.Random) -> bytes:
+    """Return the READ_RESP frame answering a MEMREAD of a parameter."""
+    return build_frame("READ_RESP", READ_RESP_PREFIX + spec.address + memory_payload(spec, rng))
+
+
+def memwrite_echo(spec: SVSParam, rng: random.Random) -> bytes:
+    """Return a MEMWRITE frame for a parameter or group as echoed by the device."""
+    return build_frame("MEMWRITE", spec.address + memory_payload(spec, rng))
+
+
+def fragment(data: bytes, size: int = DEFAULT_FRAGMENT_SIZE) -> list[bytes]:
+    """Split data into notifications of at most size bytes."""
+    return [data[start:start + size] for start in range(0, len(data), size)]
+
+
+def corrupt(frame: bytes, rng: random.Random) -> bytes:
+    """Return a copy of a frame damaged in one of the ways seen on a real link."""
+    damaged = bytearray(frame)
+    kind = rng.randrange(3)
+    if kind == 0:
+        position = rng.randrange(5, len(damaged))
+        damaged[position] ^= 1 << rng.randrange(8)
+    elif kind == 1:
+        del damaged[rng.randrange(5, len(damaged)):]
+    else:
+        damaged[3] = (damaged[3] + rng.randrange(1, 8)) & 0xFF
+    return bytes(damaged)
+
+
+def build_corpus(seed: int = 0, fragment_size: int = DEFAULT_FRAGMENT_SIZE) -> Corpus:
+    """Build a deterministic corpus covering every parameter and frame type."""
+    rng = random.Random(seed)
+    corpus = Corpus()
+
+    for name, spec in PARAMS.items():
+        corpus.encode_cases.extend(
+            (ftype, name, "") for ftype in ("SUB_INFO1", "SUB_INFO2", "SUB_INFO3")
+        )
+        if spec.mem_id > MAX_MEMORY_ID:
+            corpus.encode_cases.append(("PRESETLOADSAVE", name, ""))
+            continue
+        corpus.encode_cases.append(("MEMREAD", name, ""))
+        if spec.reset_id >= 0:
+            corpus.encode_cases.append(("RESET", name, ""))
+        if not spec.is_group:
+            corpus.encode_cases.append(("MEMWRITE", name, sample_value(spec, rng)))
+
+        corpus.frames.append(read_response(spec, rng))
+        corpus.frames.append(memwrite_echo(spec, rng))
+
+    # Every other frame type, including the SUB_INFO responses that are not decoded
+    for ftype in SVS_FRAME_TYPES:
+        if ftype not in ("READ_RESP", "MEMWRITE"):
+            corpus.frames.append(build_frame(ftype, bytes(rng.randrange(256) for _ in range(8))))
+
+    corpus.corrupted = [corrupt(frame, rng) for frame in corpus.frames]
+
+    # One frame per notification, the best case
+    corpus.streams["valid"] = list(corpus.frames)
+    # Frames split at the notification size
+    corpus.streams["fragmented"] = [
+        piece for frame in corpus.frames for piece in fragment(frame, fragment_size)
+    ]
+    # Back to back frames in a stream cut at arbitrary boundaries
+    corpus.streams["concatenated"] = fragment(b"".join(corpus.frames), fragment_size)
+    # A damaged frame and line noise before every valid frame
+    noisy = bytearray()
+    for frame, damaged in zip(corpus.frames, corpus.corrupted):
+        noisy += damaged
+        noisy += bytes(rng.randrange(256) for _ in range(rng.randrange(4)))
+        noisy += frame
+    corpus.streams["corrupted"] = fragment(bytes(noisy), fragment_size)
+
+    return corpus
@@ -0,0 +1,197 @@
+"""Replay a raw frame capture through the notification handler and the coordinator.
+
+Captures are recorded when the "Capture raw frames" option is enabled and
+come with the diagnostics download. Run from the repository root:
+
+    python -m benchmarks.replay config_entry-svs_subwoofer-....json
+    python -m benchmarks.replay capture.svscap --speed 1
+
+The received notifications are fed to SVSDevice._notification_handler in
+order, as fast as possible by default or at a multiple of the original pace.
+The decoded values go on to an SVSCoordinator, on a Home Assistant instance
+of its own, which publishes them the way the integration does. That needs
+Home Assistant installed, --device-only stops at the device. Requests in the
+capture are matched with their responses to show how long the device took
+to answer.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+from base64 import b64decode
+from collections.abc import Callable
+import json
+from pathlib import Path
+import sys
+import tempfile
+import time
+from types import SimpleNamespace
+from typing import Any
+
+from custom_components.svs_subwoofer.capture import (
+    DIRECTION_RX,
+    DIRECTION_TX,
+    CaptureRecord,
+    parse_capture,
+)
+from custom_components.svs_subwoofer.device import SVSDevice
+from custom_components.svs_subwoofer.protocol import (
+    PARAMS,
+    FrameReassembler,
+    svs_decode,
+    svs_decode_verified,
+)
+
+from .bench_protocol import percentile
+
+
+def load_capture(path: Path) -> tuple[float, list[CaptureRecord]]:
+    """Load a capture file, or the capture inside a diagnostics download."""
+    data = path.read_bytes()
+    if data[:1] == b"{":
+        diagnostics = json.loads(data)
+        capture = diagnostics.get("data", diagnostics).get("capture")
+        if not capture:
+            raise ValueError(f"{path} has no capture, enable capturing in the options")
+        data = b64decode(capture["data"])
+    return parse_capture(data)
+
+
+def response_times(records: list[CaptureRecord]) -> dict[str, list[float]]:
+    """Return the time in ms each request type took to be answered in the capture."""
+    reassembler = FrameReassembler()
+    # Memory range -> (request frame type, time it was written)
+    waiting: dict[tuple[int, int, int], tuple[str, int]] = {}
+    times: dict[str, list[float]] = {}
+    for record in records:
+        if record.direction == DIRECTION_TX:
+            decoded = svs_decode(record.data)
+            if "MEMORY" in decoded:
+                waiting[decoded["MEMORY"]] = (decoded["FRAME_TYPE"], record.offset_ns)
+            continue
+        for frame in reassembler.feed(record.data):
+            memory = svs_decode_verified(frame).get("MEMORY")
+            if (request := waiting.pop(memory, None)) is not None:
+                ftype, sent_ns = request
+                times.setdefault(ftype, []).append((record.offset_ns - sent_ns) / 1e6)
+    return times
+
+
+def create_coordinator(device: SVSDevice, config_dir: str) -> Any:
+    """Return a coordinator publishing the values of a device, on its own Home Assistant."""
+    # Home Assistant is only needed past the device, import it on demand
+    from homeassistant.const import CONF_ADDRESS
+    from homeassistant.core import HomeAssistant
+
+    from custom_components.svs_subwoofer.const import DATA_SLOT_MANAGER, DOMAIN
+    from custom_components.svs_subwoofer.coordinator import SVSCoordinator
+    from custom_components.svs_subwoofer.slots import SVSSlotManager
+
+    hass = HomeAssistant(config_dir)
+    hass.data[DOMAIN] = {DATA_SLOT_MANAGER: SVSSlotManager()}
+    # The coordinator only reads the id, data and options of its entry.
+    # Without a model it keeps every parameter, as for an unknown model.
+    entry = SimpleNamespace(
+        entry_id="replay", data={CONF_ADDRESS: device.address}, options={}
+    )
+    return SVSCoordinator(hass, entry, device)
+
+
+async def replay(
+    records: list[CaptureRecord],
+    device: SVSDevice,
+    speed: float | None = None,
+    on_notification: Callable[[float], None] | None = None,
+) -> None:
+    """Feed the received notifications to a device, at speed times the original pace."""
+    start = time.monotonic()
+    for record in records:
+        if record.direction != DIRECTION_RX:
+            continue
+        if speed:
+            delay = start + record.offset_ns / 1e9 / speed - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+        handled = time.perf_counter()
+        device._notification_handler(0, bytearray(record.data))
+        if on_notification is not None:
+            on_notification((time.perf_counter() - handled) * 1e6)
+
+
+async def run(args: argparse.Namespace) -> int:
+    """Replay a capture and print what happened."""
+    start_time, records = load_capture(args.capture)
+    received = [record for record in records if record.direction == DIRECTION_RX]
+    print(
+        f"{len(records)} records, {len(records) - len(received)} written, "
+        f"{len(received)} received, starting {time.ctime(start_time)}"
+    )
+
+    for ftype, samples in sorted(response_times(records).items()):
+        samples.sort()
+        print(
+            f"  {ftype:<16}{len(samples):>6} answered, p50 {percentile(samples, 0.5):.1f} ms, "
+            f"p90 {percentile(samples, 0.9):.1f} ms, max {samples[-1]:.1f} ms"
+        )
+
+    device = SVSDevice("00:00:00:00:00:00")
+    updates: list[dict[str, Any]] = []
+    device.register_callback(updates.append)
+    published = 0
+
+    def count_published() -> None:
+        """Count the publishes that changed at least one value."""
+        nonlocal published
+        published += 1
+
+    with tempfile.TemporaryDirectory() as config_dir:
+        if not args.device_only:
+            try:
+                coordinator = create_coordinator(device, config_dir)
+            except ImportError as err:
+                print(f"{err}, install Home Assistant or replay with --device-only")
+                return 1
+            coordinator.async_add_key_listener(PARAMS, count_published)
+        handler_us: list[float] = []
+        elapsed = time.perf_counter()
+        await replay(records, device, args.speed, handler_us.append)
+        elapsed = time.perf_counter() - elapsed
+
+    statistics = device.statistics
+    print(
+        f"Replayed in {elapsed:.3f} s: {statistics['frames']} frames, {len(updates)} updates, "
+        f"{statistics['out_of_sync']} out of sync, {statistics['crc_failures']} CRC failures, "
+        f"{statistics['dropped_bytes']} bytes dropped"
+    )
+    if not args.device_only:
+        print(
+            f"Coordinator published {published} changes, "
+            f"{len(coordinator.data)} values in its state"
+        )
+    if handler_us:
+        handler_us.sort()
+        print(
+            f"Notification handler p50 {percentile(handler_us, 0.5):.1f} us, "
+            f"p99 {percentile(handler_us, 0.99):.1f} us, max {handler_us[-1]:.1f} us"
+        )
+    return 0
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Parse the arguments and replay the capture."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("capture", type=Path, help="capture or diagnostics file")
+    parser.add_argument(
+        "--speed", type=float, default=None,
+        help="multiple of the original pace, as fast as possible if omitted",
+    )
+    parser.add_argument(
+        "--device-only", action="store_true",
+        help="stop at the device, without Home Assistant and the coordinator",
+    )
+    args = parser.parse_args(argv)
+    return asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
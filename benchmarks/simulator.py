@@ -0,0 +1,282 @@
+"""Simulated SVS subwoofer speaking the frame protocol over a fake GATT link.
+
+The connector returned by SimulatedSubwoofer.connector() takes the place of
+establish_connection, so SVSDevice, and the coordinator on top of it, run
+unchanged against it:
+
+    subwoofer = SimulatedSubwoofer(LinkProfile(latency=0.02, mtu=23))
+    device = SVSDevice(subwoofer.address, connector=subwoofer.connector())
+    await device.connect(subwoofer.ble_device)
+"""
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Callable
+from dataclasses import dataclass
+import itertools
+import random
+from typing import Any
+
+from bleak.exc import BleakError
+
+from custom_components.svs_subwoofer.const import CHAR_UUID
+from custom_components.svs_subwoofer.protocol import (
+    PARAMS,
+    PRESET_ACTION_ID,
+    FrameReassembler,
+    build_frame,
+    encode_value,
+    svs_decode,
+)
+
+from .corpus import READ_RESP_PREFIX
+
+# Memory blocks of the device, id to size in bytes
+MEMORY_SIZES = {4: 52, 8: 8, 9: 8, 0xA: 8}
+
+PRESET_NAMES = {8: "MOVIE", 9: "MUSIC", 0xA: "NIGHT"}
+
+# Answers to the SUB_INFO requests, the payload format is not documented
+SUB_INFO = {
+    "SUB_INFO1": b"SB-1000 Pro",
+    "SUB_INFO2": b"1.0.0",
+    "SUB_INFO3": b"\x00",
+}
+
+_ADDRESSES = itertools.count(1)
+
+
+@dataclass
+class LinkProfile:
+    """Characteristics of the simulated Bluetooth link."""
+
+    # One way delay and uniform jitter added to it, in seconds
+    latency: float = 0.02
+    jitter: float = 0.0
+    # ATT MTU, notifications carry at most mtu - 3 bytes
+    mtu: int = 23
+    # Chance that a single notification is lost
+    drop_rate: float = 0.0
+    # Chance that the link drops when a frame is written
+    disconnect_rate: float = 0.0
+    # Time a connection attempt takes
+    connect_time: float = 0.0
+    seed: int | None = None
+
+
+def default_value(name: str) -> Any:
+    """Return the factory value of a parameter."""
+    spec = PARAMS[name]
+    if spec.limits_type == 1:
+        return spec.limits[0]
+    if name == "VOLUME":
+        return -20
+    return min(max(0, spec.low), spec.high)
+
+
+def factory_memory() -> dict[int, bytearray]:
+    """Return the memory content of a subwoofer with factory settings."""
+    memory = {mem_id: bytearray(size) for mem_id, size in MEMORY_SIZES.items()}
+    for name, spec in PARAMS.items():
+        if spec.mem_id == 4 and not spec.is_group:
+            memory[4][spec.offset:spec.end] = encode_value(spec, default_value(name))
+    for mem_id, preset_name in PRESET_NAMES.items():
+        memory[mem_id][:] = encode_value(PARAMS[f"PRESET{mem_id - 7}NAME"], preset_name)
+    return memory
+
+
+class SimulatedSubwoofer:
+    """Memory map and frame handling of one subwoofer."""
+
+    def __init__(
+        self,
+        profile: LinkProfile | None = None,
+        address: str | None = None,
+        model: str | None = None,
+    ) -> None:
+        """Initialize the subwoofer with factory settings, model overrides SUB_INFO1."""
+        self.profile = profile or LinkProfile()
+        self.sub_info = dict(SUB_INFO)
+        if model is not None:
+            self.sub_info["SUB_INFO1"] = model.encode()
+        if address is None:
+            high, low = divmod(next(_ADDRESSES), 256)
+            address = f"5C:F2:86:00:{high:02X}:{low:02X}"
+        self.address = address
+        self.memory = factory_memory()
+        # Settings block saved in each of the three device presets
+        self.presets = {slot: bytes(self.memory[4]) for slot in (1, 2, 3)}
+        self.random = random.Random(self.profile.seed)
+        self.client: SimulatedClient | None = None
+        self.frames_received = 0
+        self.notifications_sent = 0
+        self.notifications_dropped = 0
+        self.disconnects = 0
+
+    @property
+    def ble_device(self) -> Any:
+        """Return a stand-in for the BLEDevice passed to the connector."""
+        return self.address
+
+    def connector(self) -> Callable[..., Any]:
+        """Return a connector to pass to SVSDevice."""
+
+        async def _connect(
+            ble_device: Any,
+            name: str,
+            disconnected_callback: Callable[[Any], None] | None = None,
+            **kwargs: Any,
+        ) -> SimulatedClient:
+            if self.profile.connect_time:
+                await asyncio.sleep(self.profile.connect_time)
+            self.client = SimulatedClient(self, disconnected_callback)
+            return self.client
+
+        return _connect
+
+    def value(self, name: str) -> Any:
+        """Return the current value of a parameter as the device holds it."""
+        spec = PARAMS[name]
+        frame = self._read_response(spec.mem_id, spec.offset, spec.n_bytes)
+        return svs_decode(frame)["VALIDATED_VALUES"].get(name)
+
+    def handle_frame(self, frame: bytes) -> list[bytes]:
+        """Apply a frame written by the host and return the response frames."""
+        self.frames_received += 1
+        decoded = svs_decode(frame)
+        ftype = decoded.get("FRAME_TYPE")
+        payload = frame[5:-2]
+
+        if ftype == "MEMREAD":
+            return [self._read_response(*decoded["MEMORY"])]
+        if ftype == "MEMWRITE":
+            mem_id, offset, size = decoded["MEMORY"]
+            block = self.memory.get(mem_id)
+            if block is None or offset + size > len(block) or len(payload) != 8 + size:
+                return []
+            block[offset:offset + size] = payload[8:]
+            return [self._read_response(mem_id, offset, size)]
+        if ftype == "RESET":
+            reset_id = payload[0]
+            factory = factory_memory()
+            for spec in PARAMS.values():
+                if spec.reset_id == reset_id and spec.mem_id in self.memory:
+                    self.memory[spec.mem_id][spec.offset:spec.end] = (
+                        factory[spec.mem_id][spec.offset:spec.end]
+                    )
+            return [self._read_response(4, 0, MEMORY_SIZES[4])]
+        if ftype == "PRESETLOADSAVE":
+            action = int.from_bytes(payload[:4], "little") - PRESET_ACTION_ID
+            if action < 3:
+                self.memory[4][:] = self.presets[action + 1]
+            elif action == 3:
+                self.memory[4][:] = factory_memory()[4]
+            elif action < 7:
+                self.presets[action - 3] = bytes(self.memory[4])
+                return []
+            return [self._read_response(4, 0, MEMORY_SIZES[4])]
+        if ftype in self.sub_info:
+            return [build_frame(f"{ftype}_RESP", self.sub_info[ftype])]
+        return []
+
+    def _read_response(self, mem_id: int, offset: int, size: int) -> bytes:
+        """Return the READ_RESP frame for a memory range."""
+        block = self.memory.get(mem_id, b"")
+        address = (
+            mem_id.to_bytes(4, "little")
+            + offset.to_bytes(2, "little")
+            + size.to_bytes(2, "little")
+        )
+        return build_frame(
+            "READ_RESP", READ_RESP_PREFIX + address + bytes(block[offset:offset + size])
+        )
+
+
+class SimulatedClient:
+    """GATT client connected to a simulated subwoofer, used in place of BleakClient."""
+
+    def __init__(
+        self,
+        subwoofer: SimulatedSubwoofer,
+        disconnected_callback: Callable[[Any], None] | None,
+    ) -> None:
+        """Initialize the client."""
+        self.subwoofer = subwoofer
+        self._disconnected_callback = disconnected_callback
+        self._notify: Callable[[Any, bytearray], None] | None = None
+        self._reassembler = FrameReassembler()
+        self._connected = True
+        # Notifications are delivered in order, jitter only delays them
+        self._last_delivery = 0.0
+
+    @property
+    def is_connected(self) -> bool:
+        """Return True while the link is up."""
+        return self._connected
+
+    @property
+    def mtu_size(self) -> int:
+        """Return the negotiated ATT MTU."""
+        return self.subwoofer.profile.mtu
+
+    async def start_notify(self, char: str, callback: Callable[[Any, bytearray], None]) -> None:
+        """Subscribe to notifications."""
+        if char != CHAR_UUID:
+            raise ValueError(f"Unknown characteristic {char}")
+        self._notify = callback
+
+    async def stop_notify(self, char: str) -> None:
+        """Unsubscribe from notifications."""
+        self._notify = None
+
+    async def disconnect(self) -> bool:
+        """Disconnect from the subwoofer."""
+        self._connected = False
+        return True
+
+    async def write_gatt_char(self, char: Any, data: bytes, response: bool = False) -> None:
+        """Write to the subwoofer, which answers through notifications."""
+        if not self._connected:
+            raise BleakError("Not connected")
+        subwoofer = self.subwoofer
+        profile = subwoofer.profile
+
+        if subwoofer.random.random() < profile.disconnect_rate:
+            self._drop_link()
+            raise BleakError("Disconnected")
+
+        # The subwoofer handles the write one trip after it was sent and its
+        # answer takes another trip back, as does the write acknowledgement
+        round_trip = 2 * (profile.latency + subwoofer.random.uniform(0, profile.jitter))
+        responses = [
+            response_frame
+            for frame in self._reassembler.feed(data)
+            for response_frame in subwoofer.handle_frame(frame)
+        ]
+        if responses:
+            loop = asyncio.get_running_loop()
+            deliver_at = max(loop.time() + round_trip, self._last_delivery)
+            self._last_delivery = deliver_at
+            loop.call_at(deliver_at, self._deliver, b"".join(responses))
+        if response:
+            await asyncio.sleep(round_trip)
+
+    def _deliver(self, data: bytes) -> None:
+        """Send response frames as notifications sized to the MTU."""
+        subwoofer = self.subwoofer
+        size = subwoofer.profile.mtu - 3
+        for start in range(0, len(data), size):
+            if not self._connected or self._notify is None:
+                return
+            if subwoofer.random.random() < subwoofer.profile.drop_rate:
+                subwoofer.notifications_dropped += 1
+                continue
+            subwoofer.notifications_sent += 1
+            self._notify(0, bytearray(data[start:start + size]))
+
+    def _drop_link(self) -> None:
+        """Drop the link as if the subwoofer went out of range."""
+        self._connected = False
+        self.subwoofer.disconnects += 1
+        if self._disconnected_callback is not None:
+            asyncio.get_running_loop().call_soon(self._disconnected_callback, self)
@@ -3,53 +3,52 @@ from __future__ import annotations
 
 import logging
 
-from bleak.exc import BleakError
-
-from homeassistant.components import bluetooth
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import CONF_ADDRESS, Platform
 from homeassistant.core import HomeAssistant
-from homeassistant.exceptions import ConfigEntryNotReady
-
-from .const import DOMAIN
+from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers.storage import Store
+from homeassistant.helpers.typing import ConfigType
+
+from .const import (
+    CONF_CAPTURE,
+    CONF_IDLE_DISCONNECT,
+    DATA_SLOT_MANAGER,
+    DOMAIN,
+    IDLE_DISCONNECT_TIMEOUT,
+    STORAGE_VERSION,
+)
 from .coordinator import SVSCoordinator
 from .device import SVSDevice
+from .presets import presets_store
+from .services import async_setup_services
+from .slots import SVSSlotManager
 
 _LOGGER = logging.getLogger(__name__)
 
-PLATFORMS: list[Platform] = [Platform.MEDIA_PLAYER, Platform.SELECT]
+PLATFORMS: list[Platform] = [Platform.MEDIA_PLAYER, Platform.SELECT, Platform.SENSOR]
+
+CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
+
+
+async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
+    """Set up the SVS Subwoofer services and connection slot sharing."""
+    hass.data.setdefault(DOMAIN, {})[DATA_SLOT_MANAGER] = SVSSlotManager()
+    async_setup_services(hass)
+    return True
 
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up SVS Subwoofer from a config entry."""
     address = entry.data[CONF_ADDRESS]
 
-    # Get BLE device from Home Assistant's Bluetooth integration
-    # This works transparently with ESPHome proxies
-    ble_device = bluetooth.async_ble_device_from_address(
-        hass, address, connectable=True
-    )
-
-    if not ble_device:
-        raise ConfigEntryNotReady(
-            f"Could not find SVS Subwoofer with address {address}"
-        )
-
-    # Create device instance
+    # Create device instance and coordinator
     device = SVSDevice(address)
+    device.set_capture(entry.options.get(CONF_CAPTURE, False))
+    coordinator = SVSCoordinator(hass, entry, device)
 
-    try:
-        await device.connect(ble_device)
-    except BleakError as err:
-        raise ConfigEntryNotReady(
-            f"Could not connect to SVS Subwoofer: {err}"
-        ) from err
-
-    # Create coordinator
-    coordinator = SVSCoordinator(hass, device, ble_device)
-
-    # Perform initial data fetch
-    await coordinator.async_config_entry_first_refresh()
+    # Entities come up from the last known settings, if any
+    await coordinator.async_load_cache()
 
     # Store coordinator
     hass.data.setdefault(DOMAIN, {})
@@ -58,9 +57,23 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     # Set up platforms
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
 
+    entry.async_on_unload(entry.add_update_listener(_async_update_options))
+
+    # Connect in the background, entities become available once the link is up
+    coordinator.connection.async_start()
+
     return True
 
 
+async def _async_update_options(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Apply changed options without reconnecting."""
+    coordinator: SVSCoordinator = hass.data[DOMAIN][entry.entry_id]
+    coordinator.device.set_capture(entry.options.get(CONF_CAPTURE, False))
+    coordinator.connection.async_set_idle_timeout(
+        IDLE_DISCONNECT_TIMEOUT if entry.options.get(CONF_IDLE_DISCONNECT, False) else None
+    )
+
+
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
     if unload_ok := await hass.config_entries.async_unload_platforms(entry, PLATFORMS):
@@ -68,3 +81,9 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         await coordinator.async_shutdown()
 
     return unload_ok
+
+
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Remove the settings cache and presets of a removed config entry."""
+    await Store(hass, STORAGE_VERSION, f"{DOMAIN}.{entry.entry_id}").async_remove()
+    await presets_store(hass, entry.entry_id).async_remove()
@@ -0,0 +1,84 @@
+"""Raw frame capture for SVS Subwoofer."""
+from __future__ import annotations
+
+from collections import deque
+import struct
+import time
+from typing import Final, NamedTuple
+
+from .const import CAPTURE_BUFFER_SIZE
+
+# File header: magic and wall clock time of the first record
+CAPTURE_MAGIC: Final = b"SVSCAP\x00\x01"
+_FILE_HEADER: Final = struct.Struct("<8sd")
+# Record header: nanoseconds since the first record, direction and data length
+_RECORD_HEADER: Final = struct.Struct("<QBH")
+
+DIRECTION_TX: Final = 0
+DIRECTION_RX: Final = 1
+
+
+class CaptureRecord(NamedTuple):
+    """A frame written to, or a notification received from, the device."""
+
+    offset_ns: int
+    direction: int
+    data: bytes
+
+
+class SVSCapture:
+    """Ring buffer of the raw bytes exchanged with a device."""
+
+    __slots__ = ("max_bytes", "dropped", "_records", "_bytes", "_start_ns", "_start_time")
+
+    def __init__(self, max_bytes: int = CAPTURE_BUFFER_SIZE) -> None:
+        """Initialize an empty capture holding up to max_bytes of records."""
+        self.max_bytes = max_bytes
+        self.dropped = 0
+        self._records: deque[bytes] = deque()
+        self._bytes = 0
+        self._start_ns: int | None = None
+        self._start_time = 0.0
+
+    def __len__(self) -> int:
+        """Return the number of records held."""
+        return len(self._records)
+
+    def record(self, direction: int, data: bytes | bytearray) -> None:
+        """Add a record, dropping the oldest ones once the buffer is full."""
+        now = time.monotonic_ns()
+        if self._start_ns is None:
+            self._start_ns = now
+            self._start_time = time.time()
+        record = _RECORD_HEADER.pack(now - self._start_ns, direction, len(data)) + data
+        self._records.append(record)
+        self._bytes += len(record)
+        while self._bytes > self.max_bytes:
+            self._bytes -= len(self._records.popleft())
+            self.dropped += 1
+
+    def export(self) -> bytes:
+        """Return the capture in its binary file format."""
+        return _FILE_HEADER.pack(CAPTURE_MAGIC, self._start_time) + b"".join(self._records)
+
+    def clear(self) -> None:
+        """Discard every record."""
+        self._records.clear()
+        self._bytes = 0
+        self._start_ns = None
+
+
+def parse_capture(data: bytes) -> tuple[float, list[CaptureRecord]]:
+    """Return the start time and records of an exported capture."""
+    magic, start_time = _FILE_HEADER.unpack_from(data)
+    if magic != CAPTURE_MAGIC:
+        raise ValueError("Not an SVS capture")
+
+    records: list[CaptureRecord] = []
+    position = _FILE_HEADER.size
+    while position < len(data):
+        offset_ns, direction, length = _RECORD_HEADER.unpack_from(data, position)
+        position += _RECORD_HEADER.size
+        records.append(CaptureRecord(offset_ns, direction, data[position:position + length]))
+        position += length
+    return start_time, records
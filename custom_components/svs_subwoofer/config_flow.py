@@ -9,15 +9,39 @@ import voluptuous as vol
 
 from homeassistant.components import bluetooth
 from homeassistant.components.bluetooth import BluetoothServiceInfoBleak
-from homeassistant.config_entries import ConfigFlow, ConfigFlowResult
+from homeassistant.config_entries import (
+    ConfigEntry,
+    ConfigFlow,
+    ConfigFlowResult,
+    OptionsFlow,
+)
 from homeassistant.const import CONF_ADDRESS
-
-from .const import DOMAIN, SERVICE_UUID
+from homeassistant.core import callback
+
+from .const import (
+    CONF_CAPTURE,
+    CONF_DEEP_CHECK,
+    CONF_IDLE_DISCONNECT,
+    DOMAIN,
+    MIN_RSSI,
+    SERVICE_UUID,
+)
 from .device import SVSDevice
 
 _LOGGER = logging.getLogger(__name__)
 
 
+def _validate_advertisement(service_info: BluetoothServiceInfoBleak) -> str | None:
+    """Return the reason an advertisement is not from a usable SVS subwoofer, if any."""
+    if SERVICE_UUID.lower() not in [s.lower() for s in service_info.service_uuids]:
+        return "not_supported"
+    if not service_info.connectable:
+        return "cannot_connect"
+    if service_info.rssi is not None and service_info.rssi < MIN_RSSI:
+        return "weak_signal"
+    return None
+
+
 class SVSConfigFlow(ConfigFlow, domain=DOMAIN):
     """Handle a config flow for SVS Subwoofer."""
 
@@ -28,6 +52,12 @@ class SVSConfigFlow(ConfigFlow, domain=DOMAIN):
         self._discovery_info: BluetoothServiceInfoBleak | None = None
         self._discovered_devices: dict[str, BluetoothServiceInfoBleak] = {}
 
+    @staticmethod
+    @callback
+    def async_get_options_flow(config_entry: ConfigEntry) -> OptionsFlow:
+        """Return the options flow."""
+        return SVSOptionsFlow(config_entry)
+
     async def async_step_bluetooth(
         self, discovery_info: BluetoothServiceInfoBleak
     ) -> ConfigFlowResult:
@@ -38,21 +68,10 @@ class SVSConfigFlow(ConfigFlow, domain=DOMAIN):
 
         self._discovery_info = discovery_info
 
-        # Try to connect to validate the device
-        device = SVSDevice(discovery_info.address)
-        ble_device = bluetooth.async_ble_device_from_address(
-            self.hass, discovery_info.address, connectable=True
-        )
-
-        if not ble_device:
-            return self.async_abort(reason="no_devices_found")
-
-        try:
-            await device.connect(ble_device)
-            await device.disconnect()
-        except BleakError as err:
-            _LOGGER.warning("Could not connect to device: %s", err)
-            return self.async_abort(reason="cannot_connect")
+        # The advertisement is enough, connecting would take a proxy slot.
+        # A weak signal may improve, it is shown on the form instead of aborting.
+        if (error := _validate_advertisement(discovery_info)) and error != "weak_signal":
+            return self.async_abort(reason=error)
 
         return await self.async_step_confirm()
 
@@ -60,18 +79,26 @@ class SVSConfigFlow(ConfigFlow, domain=DOMAIN):
         self, user_input: dict[str, Any] | None = None
     ) -> ConfigFlowResult:
         """Confirm discovery."""
-        if user_input is not None:
+        address = self._discovery_info.address
+        # Judge the signal on the newest advertisement
+        service_info = (
+            bluetooth.async_last_service_info(self.hass, address, connectable=True)
+            or self._discovery_info
+        )
+        errors: dict[str, str] = {}
+        if error := _validate_advertisement(service_info):
+            errors["base"] = error
+        elif user_input is not None:
             return self.async_create_entry(
-                title=f"SVS Subwoofer {self._discovery_info.address[-5:]}",
-                data={CONF_ADDRESS: self._discovery_info.address},
+                title=f"SVS Subwoofer {address[-5:]}",
+                data={CONF_ADDRESS: address},
             )
 
         self._set_confirm_only()
         return self.async_show_form(
             step_id="confirm",
-            description_placeholders={
-                "name": f"SVS Subwoofer {self._discovery_info.address[-5:]}"
-            },
+            description_placeholders={"name": f"SVS Subwoofer {address[-5:]}"},
+            errors=errors,
         )
 
     async def async_step_user(
@@ -83,35 +110,14 @@ class SVSConfigFlow(ConfigFlow, domain=DOMAIN):
             await self.async_set_unique_id(address, raise_on_progress=False)
             self._abort_if_unique_id_configured()
 
-            # Validate connection
-            ble_device = bluetooth.async_ble_device_from_address(
-                self.hass, address, connectable=True
-            )
-
-            if not ble_device:
-                return self.async_show_form(
-                    step_id="user",
-                    data_schema=vol.Schema(
-                        {
-                            vol.Required(CONF_ADDRESS): str,
-                        }
-                    ),
-                    errors={"base": "no_devices_found"},
-                )
-
-            device = SVSDevice(address)
-            try:
-                await device.connect(ble_device)
-                await device.disconnect()
-            except BleakError:
+            # Connecting is an optional deep check, the advertisement was validated
+            if user_input.get(CONF_DEEP_CHECK) and (
+                error := await self._async_deep_check(address)
+            ):
                 return self.async_show_form(
                     step_id="user",
-                    data_schema=vol.Schema(
-                        {
-                            vol.Required(CONF_ADDRESS): str,
-                        }
-                    ),
-                    errors={"base": "cannot_connect"},
+                    data_schema=self._user_schema(),
+                    errors={"base": error},
                 )
 
             return self.async_create_entry(
@@ -129,7 +135,7 @@ class SVSConfigFlow(ConfigFlow, domain=DOMAIN):
             if (
                 service_info.address not in current_addresses
                 and service_info.address not in self._discovered_devices
-                and SERVICE_UUID.lower() in [s.lower() for s in service_info.service_uuids]
+                and _validate_advertisement(service_info) is None
             ):
                 self._discovered_devices[service_info.address] = service_info
 
@@ -137,16 +143,68 @@ class SVSConfigFlow(ConfigFlow, domain=DOMAIN):
             return self.async_abort(reason="no_devices_found")
 
         # Show device selection
+        return self.async_show_form(step_id="user", data_schema=self._user_schema())
+
+    def _user_schema(self) -> vol.Schema:
+        """Return the schema to pick a discovered device."""
+        return vol.Schema(
+            {
+                vol.Required(CONF_ADDRESS): vol.In(
+                    {
+                        address: f"SVS Subwoofer {address}"
+                        for address in self._discovered_devices
+                    }
+                ),
+                vol.Optional(CONF_DEEP_CHECK, default=False): bool,
+            }
+        )
+
+    async def _async_deep_check(self, address: str) -> str | None:
+        """Connect and read from the device, return an error if that fails."""
+        ble_device = bluetooth.async_ble_device_from_address(
+            self.hass, address, connectable=True
+        )
+        if not ble_device:
+            return "no_devices_found"
+
+        device = SVSDevice(address)
+        try:
+            await device.connect(ble_device)
+            await device.probe()
+        except BleakError as err:
+            _LOGGER.warning("Could not connect to device: %s", err)
+            return "cannot_connect"
+        finally:
+            await device.disconnect()
+        return None
+
+
+class SVSOptionsFlow(OptionsFlow):
+    """Handle the options of an SVS Subwoofer."""
+
+    def __init__(self, config_entry: ConfigEntry) -> None:
+        """Initialize the options flow."""
+        self._entry = config_entry
+
+    async def async_step_init(
+        self, user_input: dict[str, Any] | None = None
+    ) -> ConfigFlowResult:
+        """Manage the options."""
+        if user_input is not None:
+            return self.async_create_entry(data=user_input)
+
         return self.async_show_form(
-            step_id="user",
+            step_id="init",
             data_schema=vol.Schema(
                 {
-                    vol.Required(CONF_ADDRESS): vol.In(
-                        {
-                            address: f"SVS Subwoofer {address}"
-                            for address in self._discovered_devices
-                        }
-                    ),
+                    vol.Optional(
+                        CONF_CAPTURE,
+                        default=self._entry.options.get(CONF_CAPTURE, False),
+                    ): bool,
+                    vol.Optional(
+                        CONF_IDLE_DISCONNECT,
+                        default=self._entry.options.get(CONF_IDLE_DISCONNECT, False),
+                    ): bool,
                 }
             ),
         )
@@ -0,0 +1,328 @@
+"""Connection lifecycle management for SVS Subwoofer."""
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Callable
+from datetime import datetime
+import logging
+import random
+import time
+
+from bleak.exc import BleakError
+
+from homeassistant.components import bluetooth
+from homeassistant.components.bluetooth import (
+    BluetoothCallbackMatcher,
+    BluetoothChange,
+    BluetoothScanningMode,
+    BluetoothServiceInfoBleak,
+)
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_track_time_interval
+
+from .const import (
+    LIVENESS_TIMEOUT,
+    RECONNECT_BACKOFF_MAX,
+    RECONNECT_BACKOFF_MIN,
+    SLOT_WAIT_TIMEOUT,
+    WATCHDOG_INTERVAL,
+)
+from .device import SVSDevice
+from .scheduler import PRIORITY_BACKGROUND, CommandCancelled
+from .slots import SVSSlotManager
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class SVSConnectionManager:
+    """Keep the Bluetooth connection to a subwoofer up, or down when idle."""
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        device: SVSDevice,
+        slots: SVSSlotManager,
+        idle_timeout: float | None = None,
+    ) -> None:
+        """Initialize the connection manager."""
+        self.hass = hass
+        self.device = device
+        self.slots = slots
+        self.idle_timeout = idle_timeout
+        # Adapter or proxy whose connection slot we hold
+        self._slot_source: str | None = None
+        # Slot given up for another subwoofer, reconnect on demand only
+        self._yielded = False
+        # Connections made after the first, however they were started
+        self.reconnects = 0
+        self._connected_before = False
+        self._lock = asyncio.Lock()
+        self._backoff = RECONNECT_BACKOFF_MIN
+        self._wakeup = asyncio.Event()
+        self._reconnect_task: asyncio.Task[None] | None = None
+        self._idle = False
+        self._stopped = False
+        self._connect_listeners: list[CALLBACK_TYPE] = []
+        self._disconnect_listeners: list[CALLBACK_TYPE] = []
+        self._unsubscribe: list[CALLBACK_TYPE] = []
+
+        device.set_connect_handler(self.ensure_connected)
+        device.register_disconnect_callback(self._handle_disconnect)
+
+    @property
+    def idle(self) -> bool:
+        """Return True if the link was dropped because it was idle."""
+        return self._idle
+
+    @property
+    def yielded(self) -> bool:
+        """Return True if the slot was handed to another subwoofer."""
+        return self._yielded
+
+    @callback
+    def async_start(self) -> None:
+        """Connect in the background, then follow advertisements and watch the link."""
+        self._unsubscribe.append(
+            bluetooth.async_register_callback(
+                self.hass,
+                self._async_handle_advertisement,
+                BluetoothCallbackMatcher(address=self.device.address, connectable=True),
+                BluetoothScanningMode.PASSIVE,
+            )
+        )
+        self._unsubscribe.append(
+            async_track_time_interval(self.hass, self._async_watchdog, WATCHDOG_INTERVAL)
+        )
+        self.async_schedule_reconnect()
+
+    async def async_stop(self) -> None:
+        """Stop reconnecting and disconnect."""
+        self._stopped = True
+        while self._unsubscribe:
+            self._unsubscribe.pop()()
+        if self._reconnect_task is not None:
+            self._reconnect_task.cancel()
+            self._reconnect_task = None
+        await self.async_disconnect()
+
+    async def async_disconnect(self) -> None:
+        """Disconnect and give the connection slot back."""
+        try:
+            await self.device.disconnect()
+        finally:
+            self._release_slot()
+
+    @callback
+    def _release_slot(self) -> None:
+        """Give the connection slot back, if we hold one."""
+        if self._slot_source is not None:
+            self.slots.release(self._slot_source, self.device.address)
+            self._slot_source = None
+
+    async def async_yield_if_contended(self) -> None:
+        """Disconnect after a sync if another subwoofer waits for our slot."""
+        if (
+            self._slot_source is None
+            or not self.slots.has_waiters(self._slot_source)
+            or self.device.busy
+        ):
+            return
+        _LOGGER.debug(
+            "Handing connection slot of %s to a waiting subwoofer", self.device.address
+        )
+        self._yielded = True
+        await self.async_disconnect()
+        for listener in self._disconnect_listeners:
+            listener()
+
+    @callback
+    def async_add_listener(
+        self,
+        connected: CALLBACK_TYPE | None = None,
+        disconnected: CALLBACK_TYPE | None = None,
+    ) -> Callable[[], None]:
+        """Listen for the link coming up or dropping."""
+        if connected is not None:
+            self._connect_listeners.append(connected)
+        if disconnected is not None:
+            self._disconnect_listeners.append(disconnected)
+
+        @callback
+        def remove_listener() -> None:
+            """Remove the listeners."""
+            if connected is not None:
+                self._connect_listeners.remove(connected)
+            if disconnected is not None:
+                self._disconnect_listeners.remove(disconnected)
+
+        return remove_listener
+
+    async def ensure_connected(self, priority: int = PRIORITY_BACKGROUND) -> None:
+        """Connect to the device unless already connected."""
+        if self.device.is_connected:
+            return
+        if self._stopped:
+            raise BleakError("Connection manager stopped")
+
+        address = self.device.address
+        service_info = bluetooth.async_last_service_info(
+            self.hass, address, connectable=True
+        )
+        if service_info is None:
+            raise BleakError(f"Could not find SVS Subwoofer with address {address}")
+
+        # Wait for a slot before taking the lock, so a user write queues by
+        # priority instead of behind a background connect holding the lock.
+        # Subwoofers with pending user writes get the next free slot first.
+        source = service_info.source
+        while True:
+            await self._async_acquire_slot(source, priority)
+            async with self._lock:
+                # Another caller may have connected while we waited for the lock
+                if self.device.is_connected:
+                    if self._slot_source != source:
+                        self.slots.release(source, address)
+                    return
+                # A caller that shared our slot may have failed to connect, or
+                # yielded, and given the slot back while we waited for the lock
+                if address not in self.slots.holders(source):
+                    continue
+                self._slot_source = source
+                await self._async_connect(source)
+                break
+
+        for listener in self._connect_listeners:
+            listener()
+
+    async def _async_acquire_slot(self, source: str, priority: int) -> None:
+        """Wait for a connection slot of a source, giving up after a while."""
+        address = self.device.address
+        try:
+            async with asyncio.timeout(SLOT_WAIT_TIMEOUT):
+                await self.slots.acquire(source, address, priority)
+        except TimeoutError as err:
+            raise BleakError(
+                f"No free Bluetooth connection slot on {source} for {address} "
+                f"after {SLOT_WAIT_TIMEOUT:.0f} s"
+            ) from err
+
+    async def _async_connect(self, source: str) -> None:
+        """Connect holding a slot of a source, must be called with the lock held."""
+        address = self.device.address
+        ble_device = bluetooth.async_ble_device_from_address(
+            self.hass, address, connectable=True
+        )
+        if ble_device is None:
+            self._release_slot()
+            raise BleakError(f"Could not find SVS Subwoofer with address {address}")
+        try:
+            await self.device.connect(ble_device)
+        except BaseException:
+            self._release_slot()
+            raise
+        # The connection may have gone through another adapter or proxy
+        if (connected_source := self.device.source) not in (None, source):
+            self.slots.move(source, connected_source, address)
+            self._slot_source = connected_source
+        if self._connected_before:
+            self.reconnects += 1
+        self._connected_before = True
+        self._idle = False
+        self._yielded = False
+        self._backoff = RECONNECT_BACKOFF_MIN
+
+    @callback
+    def _handle_disconnect(self) -> None:
+        """Reconnect after the link dropped unexpectedly."""
+        self._release_slot()
+        for listener in self._disconnect_listeners:
+            listener()
+        self.async_schedule_reconnect()
+
+    @callback
+    def async_schedule_reconnect(self) -> None:
+        """Start the reconnect loop unless it is already running."""
+        if self._stopped or self._idle or self._yielded:
+            return
+        if self._reconnect_task is not None and not self._reconnect_task.done():
+            return
+        self._reconnect_task = self.hass.async_create_background_task(
+            self._reconnect(), f"svs_subwoofer reconnect {self.device.address}"
+        )
+
+    async def _reconnect(self) -> None:
+        """Reconnect with exponential backoff and jitter."""
+        while not self._stopped and not self.device.is_connected:
+            try:
+                await self.ensure_connected()
+            except BleakError as err:
+                delay = self._backoff * random.uniform(0.5, 1.5)
+                self._backoff = min(self._backoff * 2, RECONNECT_BACKOFF_MAX)
+                _LOGGER.debug(
+                    "Reconnect to %s failed (%s), retrying in %.1f s",
+                    self.device.address, err, delay,
+                )
+                # An advertisement from the device ends the wait early
+                self._wakeup.clear()
+                try:
+                    async with asyncio.timeout(delay):
+                        await self._wakeup.wait()
+                except TimeoutError:
+                    pass
+            else:
+                _LOGGER.debug("Reconnected to %s", self.device.address)
+
+    @callback
+    def _async_handle_advertisement(
+        self, service_info: BluetoothServiceInfoBleak, change: BluetoothChange
+    ) -> None:
+        """Reconnect as soon as the device advertises again."""
+        if self.device.is_connected or self._idle or self._yielded or self._stopped:
+            return
+        self._wakeup.set()
+        self.async_schedule_reconnect()
+
+    async def _async_watchdog(self, now: datetime) -> None:
+        """Drop idle links and catch links that are connected but silent."""
+        device = self.device
+        if not device.is_connected:
+            self.async_schedule_reconnect()
+            return
+
+        monotonic = time.monotonic()
+        if (
+            self.idle_timeout is not None
+            and monotonic - max(device.last_rx, device.last_tx) > self.idle_timeout
+            and not device.busy
+        ):
+            _LOGGER.debug("Disconnecting idle link to %s", device.address)
+            self._idle = True
+            await self.async_disconnect()
+            for listener in self._disconnect_listeners:
+                listener()
+            return
+
+        if monotonic - device.last_rx > LIVENESS_TIMEOUT:
+            try:
+                await device.probe()
+            except CommandCancelled:
+                # Dropped for a user write, whose echo shows the link is alive
+                pass
+            except BleakError as err:
+                _LOGGER.warning(
+                    "SVS subwoofer at %s stopped answering (%s), reconnecting",
+                    device.address, err,
+                )
+                await device.disconnect()
+                self._handle_disconnect()
+            return
+
+        await self.async_yield_if_contended()
+
+    @callback
+    def async_set_idle_timeout(self, idle_timeout: float | None) -> None:
+        """Change the idle timeout, reconnecting if idle disconnect was turned off."""
+        self.idle_timeout = idle_timeout
+        if idle_timeout is None and self._idle:
+            self._idle = False
+            self.async_schedule_reconnect()
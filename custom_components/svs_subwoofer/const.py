@@ -1,13 +1,76 @@
 """Constants for the SVS Subwoofer integration."""
+from datetime import timedelta
 from typing import Final
 
 DOMAIN: Final = "svs_subwoofer"
-PLATFORMS: Final = ["media_player", "select"]
+PLATFORMS: Final = ["media_player", "select", "sensor"]
+
+CONF_DEEP_CHECK: Final = "deep_check"
+CONF_CAPTURE: Final = "capture"
+CONF_IDLE_DISCONNECT: Final = "idle_disconnect"
+# Identity read from the device, cached in the config entry data
+CONF_MODEL: Final = "model"
+CONF_FIRMWARE: Final = "firmware"
+
+# Key of the shared connection slot manager in hass.data[DOMAIN]
+DATA_SLOT_MANAGER: Final = "slot_manager"
 
 # Bluetooth characteristic UUID for SVS subwoofer
 CHAR_UUID: Final = "6409d79d-cd28-479c-a639-92f9e1948b43"
 SERVICE_UUID: Final = "1fee6acf-a826-4e37-9635-4d8a01642c5d"
 
+# Last known settings cache
+STORAGE_VERSION: Final = 1
+STORAGE_SAVE_DELAY: Final = 10
+
+# Polling, settings changes are pushed through notifications
+POLL_INTERVAL: Final = timedelta(seconds=30)
+POLL_INTERVAL_ACTIVE: Final = timedelta(seconds=5)
+POLL_INTERVAL_IDLE: Final = timedelta(minutes=5)
+ACTIVE_POLL_WINDOW: Final = timedelta(minutes=1)
+IDLE_AFTER: Final = timedelta(minutes=10)
+
+# Connection lifecycle
+RECONNECT_BACKOFF_MIN: Final = 1.0
+RECONNECT_BACKOFF_MAX: Final = 120.0
+WATCHDOG_INTERVAL: Final = timedelta(seconds=30)
+# A connected link without notifications for this long is probed
+LIVENESS_TIMEOUT: Final = 120.0
+# With idle disconnect enabled, a link without traffic for this long is dropped.
+# Longer than the normal poll interval, so only idle polling lets it happen.
+IDLE_DISCONNECT_TIMEOUT: Final = 90.0
+
+# Notifications per second are averaged over this many seconds
+NOTIFICATION_RATE_WINDOW: Final = 60.0
+
+# Bytes of raw frames kept when capturing
+CAPTURE_BUFFER_SIZE: Final = 64 * 1024
+
+# ATT MTU every link starts with, a write or notification carries 3 bytes less
+DEFAULT_MTU: Final = 23
+ATT_HEADER_SIZE: Final = 3
+
+# Connections each adapter or proxy can hold, ESPHome proxies have three
+SLOTS_PER_SOURCE: Final = 3
+# Longest wait for a free slot before a connect fails
+SLOT_WAIT_TIMEOUT: Final = 30.0
+
+# Time an optimistic value is shown before it is rolled back without confirmation
+OPTIMISTIC_TIMEOUT: Final = 10.0
+
+# Time to wait for a response to a read or write, and how often to resend it
+REQUEST_TIMEOUT: Final = 2.0
+REQUEST_RETRIES: Final = 2
+# The SUB_INFO responses are not documented, do not hold up a sync waiting for them
+IDENTITY_TIMEOUT: Final = 1.0
+# Reads sent back to back before waiting for responses
+READ_WINDOW: Final = 4
+# Minimum time between two writes of the same continuous parameter
+WRITE_MIN_INTERVAL: Final = 0.1
+
+# Discovery, advertisements weaker than this are not offered
+MIN_RSSI: Final = -90
+
 # Frame constants
 FRAME_PREAMBLE: Final = b'\xaa'
 
@@ -27,6 +90,7 @@ SVS_FRAME_TYPES: Final = {
 
 SVS_PARAMS: Final = {
     "FULL_SETTINGS": {"id": 4, "offset": 0x0, "limits": [None], "limits_type": "group", "n_bytes": 52, "reset_id": -1},
+    "SEALED_SETTINGS": {"id": 4, "offset": 0x0, "limits": [None], "limits_type": "group", "n_bytes": 50, "reset_id": -1},
     "DISPLAY": {"id": 4, "offset": 0x0, "limits": [0, 1, 2], "limits_type": 1, "n_bytes": 2, "reset_id": 0},
     "DISPLAY_TIMEOUT": {"id": 4, "offset": 0x2, "limits": [0, 10, 20, 30, 40, 50, 60], "limits_type": 1, "n_bytes": 2, "reset_id": 1},
     "STANDBY": {"id": 4, "offset": 0x4, "limits": [0, 1, 2], "limits_type": 1, "n_bytes": 2, "reset_id": 2},
@@ -76,3 +140,21 @@ STANDBY_MODES: Final = {
     1: "trigger",
     2: "on"
 }
+
+# Per model: the settings block read on a full sync and the parameters the model
+# lacks. Sealed models have no port tuning. Unknown models get everything.
+_PORTED: Final = {"settings": "FULL_SETTINGS", "unsupported": frozenset()}
+_SEALED: Final = {"settings": "SEALED_SETTINGS", "unsupported": frozenset({"PORTTUNING"})}
+DEFAULT_CAPABILITIES: Final = _PORTED
+MODEL_CAPABILITIES: Final = {
+    "SB-1000 Pro": _SEALED,
+    "SB-2000 Pro": _SEALED,
+    "SB-3000": _SEALED,
+    "SB-4000": _SEALED,
+    "SB16-Ultra": _SEALED,
+    "PB-1000 Pro": _PORTED,
+    "PB-2000 Pro": _PORTED,
+    "PB-3000": _PORTED,
+    "PB-4000": _PORTED,
+    "PB16-Ultra": _PORTED,
+}
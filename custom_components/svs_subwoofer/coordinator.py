@@ -1,18 +1,47 @@
 """DataUpdateCoordinator for SVS Subwoofer."""
 from __future__ import annotations
 
+from collections.abc import Callable, Iterable
 from datetime import timedelta
+from functools import partial
 import logging
+import time
 from typing import Any
 
 from bleak.exc import BleakError
 
-from homeassistant.components import bluetooth
-from homeassistant.core import HomeAssistant
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.exceptions import HomeAssistantError, ServiceValidationError
+from homeassistant.helpers import device_registry as dr
+from homeassistant.helpers.event import async_call_later
+from homeassistant.helpers.storage import Store
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
 
-from .const import DOMAIN
+from .const import (
+    ACTIVE_POLL_WINDOW,
+    CONF_FIRMWARE,
+    CONF_IDLE_DISCONNECT,
+    CONF_MODEL,
+    DATA_SLOT_MANAGER,
+    DEFAULT_CAPABILITIES,
+    DOMAIN,
+    IDENTITY_TIMEOUT,
+    IDLE_AFTER,
+    IDLE_DISCONNECT_TIMEOUT,
+    MODEL_CAPABILITIES,
+    OPTIMISTIC_TIMEOUT,
+    POLL_INTERVAL,
+    POLL_INTERVAL_ACTIVE,
+    POLL_INTERVAL_IDLE,
+    STORAGE_SAVE_DELAY,
+    STORAGE_VERSION,
+)
+from .connection import SVSConnectionManager
 from .device import SVSDevice
+from .presets import SNAPSHOT_PARAMS, SVSPresetLibrary
+from .protocol import PARAMS, encode_value
+from .scheduler import CommandCancelled
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -23,52 +52,406 @@ class SVSCoordinator(DataUpdateCoordinator[dict[str, Any]]):
     def __init__(
         self,
         hass: HomeAssistant,
+        entry: ConfigEntry,
         device: SVSDevice,
-        ble_device: bluetooth.BLEDevice,
     ) -> None:
         """Initialize the coordinator."""
         super().__init__(
             hass,
             _LOGGER,
             name=DOMAIN,
-            update_interval=timedelta(seconds=30),
+            update_interval=POLL_INTERVAL,
+            always_update=False,
         )
+        self.entry = entry
         self.device = device
-        self.ble_device = ble_device
+        # What the model has decides what is polled and which entities exist
+        self.capabilities: dict[str, Any] = MODEL_CAPABILITIES.get(
+            entry.data.get(CONF_MODEL), DEFAULT_CAPABILITIES
+        )
+        device.settings = self.capabilities["settings"]
+        # Published snapshots are never mutated, every change creates a new dict
         self._state: dict[str, Any] = {}
+        self.data = self._state
+        self._key_listeners: dict[str, list[CALLBACK_TYPE]] = {}
+
+        # Values are pushed by notifications, polling only fills the gaps
+        self._full_read_needed = True
+        self._preset_names_read = False
+        self._identity_read = False
+        # True while _async_update_data runs, it syncs the links it connects
+        self._refreshing = False
+        # Set when the identity changed the capabilities, the entry is set up
+        # again once the refresh that read it has finished
+        self._reload_needed = False
+        self._last_change = time.monotonic()
+        self._active_until = 0.0
+        # Written values shown before the device confirmed them:
+        # key -> (written value, last device value, cancel rollback timer)
+        self._optimistic: dict[str, tuple[Any, Any, CALLBACK_TYPE]] = {}
+
+        # Last known settings, shown as stale until the device has been read
+        self.stale = False
+        self._store: Store[dict[str, Any]] = Store(
+            hass, STORAGE_VERSION, f"{DOMAIN}.{entry.entry_id}"
+        )
+        self.presets = SVSPresetLibrary(hass, entry.entry_id)
 
         # Register callback for state updates from device
         self.device.register_callback(self._handle_state_update)
 
+        self.connection = SVSConnectionManager(
+            hass,
+            device,
+            hass.data[DOMAIN][DATA_SLOT_MANAGER],
+            idle_timeout=(
+                IDLE_DISCONNECT_TIMEOUT
+                if entry.options.get(CONF_IDLE_DISCONNECT, False)
+                else None
+            ),
+        )
+        self.connection.async_add_listener(
+            self._handle_connected, self._handle_disconnected
+        )
+
+    @callback
+    def _handle_connected(self) -> None:
+        """Read everything again after (re)connecting."""
+        self._full_read_needed = True
+        self._preset_names_read = False
+        self._identity_read = False
+        self.async_update_listeners()
+        # A connect made by the running refresh is synced by that refresh,
+        # a second one would repeat the full read over the air
+        if not self._refreshing:
+            self.hass.async_create_task(self.async_request_refresh())
+
+    @callback
+    def _handle_disconnected(self) -> None:
+        """Let entities show the device as unavailable."""
+        self.async_update_listeners()
+
+    @callback
+    def async_add_key_listener(
+        self, keys: Iterable[str], update_callback: CALLBACK_TYPE
+    ) -> Callable[[], None]:
+        """Listen for changes of specific state keys."""
+        keys = frozenset(keys)
+        for key in keys:
+            self._key_listeners.setdefault(key, []).append(update_callback)
+
+        @callback
+        def remove_listener() -> None:
+            """Remove the key listener."""
+            for key in keys:
+                self._key_listeners[key].remove(update_callback)
+
+        return remove_listener
+
+    def supports(self, param: str) -> bool:
+        """Return True if the model has a parameter."""
+        return param not in self.capabilities["unsupported"]
+
+    @callback
     def _handle_state_update(self, data: dict[str, Any]) -> None:
         """Handle state updates from the device."""
-        _LOGGER.debug("State update received: %s", data)
-        self._state.update(data)
-        # Notify Home Assistant of the update
-        self.async_set_updated_data(self._state)
+        if unsupported := self.capabilities["unsupported"] & data.keys():
+            data = {key: value for key, value in data.items() if key not in unsupported}
+        if self._optimistic:
+            data = self._reconcile(data)
+        self._publish(data)
+
+    @callback
+    def _publish(self, data: dict[str, Any]) -> None:
+        """Publish the values that differ from the current state."""
+        state = self._state
+        changed = {
+            key: value
+            for key, value in data.items()
+            if key not in state or state[key] != value
+        }
+        if not changed:
+            return
+
+        _LOGGER.debug("State update received: %s", changed)
+        self._state = {**state, **changed}
+        self.data = self._state
+        self._last_change = time.monotonic()
+        self._store.async_delay_save(self._cache_data, STORAGE_SAVE_DELAY)
+
+        # Only wake the entities rendering one of the changed keys
+        listeners = dict.fromkeys(
+            listener
+            for key in changed
+            for listener in self._key_listeners.get(key, ())
+        )
+        for listener in listeners:
+            listener()
+
+    async def async_load_cache(self) -> bool:
+        """Publish the last known settings, return True if there were any."""
+        await self.presets.async_load()
+        if not (cached := await self._store.async_load()):
+            return False
+        self._state = dict(cached["settings"])
+        self.data = self._state
+        self.stale = True
+        return True
+
+    @callback
+    def _cache_data(self) -> dict[str, Any]:
+        """Return the settings to store, without unconfirmed values."""
+        settings = dict(self._state)
+        for key, (_, previous, _) in self._optimistic.items():
+            settings[key] = previous
+        return {"settings": settings}
+
+    def _reconcile(self, data: dict[str, Any]) -> dict[str, Any]:
+        """Confirm optimistic values echoed by the device, hold back stale ones."""
+        data = dict(data)
+        for key in self._optimistic.keys() & data.keys():
+            value, _, cancel_rollback = self._optimistic[key]
+            if data[key] == value:
+                cancel_rollback()
+                del self._optimistic[key]
+            else:
+                # Echo of an older write, remember it in case we roll back
+                self._optimistic[key] = (value, data.pop(key), cancel_rollback)
+        return data
+
+    @callback
+    def _set_optimistic(self, param: str, value: Any) -> None:
+        """Show a written value until the device confirms it or the rollback timer fires."""
+        if param in self._optimistic:
+            _, previous, cancel_rollback = self._optimistic[param]
+            cancel_rollback()
+        else:
+            previous = self._state.get(param)
+        self._optimistic[param] = (
+            value,
+            previous,
+            async_call_later(
+                self.hass, OPTIMISTIC_TIMEOUT, partial(self._rollback, param, value)
+            ),
+        )
+
+    async def async_set_value(self, param: str, value: Any) -> None:
+        """Write a parameter, showing the new value until the device confirms or times out."""
+        self.async_note_user_interaction()
+        self._set_optimistic(param, value)
+        self._publish({param: value})
+
+        try:
+            if PARAMS[param].limits_type == 0:
+                confirmed = await self.device.write_latest(param, value)
+            else:
+                confirmed = await self.device.write(param, value)
+        except BleakError as err:
+            self._rollback(param, value)
+            raise HomeAssistantError(f"Could not set {param}: {err}") from err
+        if not confirmed:
+            # Rejected by the encoder, nothing was sent
+            self._rollback(param, value)
+
+    async def async_set_values(self, values: dict[str, Any]) -> None:
+        """Write several parameters at once, values next to each other share a frame."""
+        if not values:
+            return
+        self.async_note_user_interaction()
+        for param, value in values.items():
+            self._set_optimistic(param, value)
+        self._publish(values)
+        try:
+            await self.device.set_many(values)
+        except (BleakError, ValueError) as err:
+            for param, value in values.items():
+                self._rollback(param, value)
+            raise HomeAssistantError(f"Could not set {', '.join(values)}: {err}") from err
+
+    @callback
+    def snapshot(self) -> dict[str, Any]:
+        """Return the current settings block, without unconfirmed values."""
+        settings = self._cache_data()["settings"]
+        return {
+            param: settings[param]
+            for param in SNAPSHOT_PARAMS
+            if param in settings and self.supports(param)
+        }
+
+    def validate_snapshot(self, snapshot: dict[str, Any]) -> None:
+        """Raise ServiceValidationError naming the first value that can't be written."""
+        for param, value in snapshot.items():
+            if not self.supports(param):
+                continue
+            if param not in SNAPSHOT_PARAMS:
+                raise ServiceValidationError(f"Preset contains unknown setting {param}")
+            try:
+                encode_value(PARAMS[param], value)
+            except ValueError as err:
+                raise ServiceValidationError(
+                    f"Preset value {value!r} for {param} is invalid: {err}"
+                ) from err
+
+    async def async_apply_snapshot(self, snapshot: dict[str, Any]) -> dict[str, Any]:
+        """Write the snapshot values that differ from the device, return what was written."""
+        # A bad stored value is reported by name, not as a failed write
+        self.validate_snapshot(snapshot)
+        if self.stale:
+            # The cached state may be out of date, write every value
+            changed = {
+                param: value for param, value in snapshot.items() if self.supports(param)
+            }
+        else:
+            changed = {
+                param: value
+                for param, value in snapshot.items()
+                if self.supports(param) and self._state.get(param) != value
+            }
+        if not changed:
+            return {}
+
+        await self.async_set_values(changed)
+        return changed
+
+    async def async_device_preset(self, param: str) -> None:
+        """Load or save one of the preset slots of the device."""
+        self.async_note_user_interaction()
+        try:
+            await self.device.preset_action(param)
+        except BleakError as err:
+            raise HomeAssistantError(f"Could not run {param}: {err}") from err
+
+    @callback
+    def _rollback(self, param: str, value: Any, _now: Any = None) -> None:
+        """Restore the device value when an optimistic value was not confirmed."""
+        optimistic = self._optimistic.get(param)
+        if optimistic is None or optimistic[0] != value:
+            return
+        _, previous, cancel_rollback = self._optimistic.pop(param)
+        cancel_rollback()
+        _LOGGER.warning(
+            "SVS subwoofer did not confirm %s=%s, reverting to %s", param, value, previous
+        )
+        self._publish({param: previous})
+
+    @callback
+    def async_note_user_interaction(self) -> None:
+        """Poll faster for a while after the user changed a setting."""
+        self._active_until = time.monotonic() + ACTIVE_POLL_WINDOW.total_seconds()
+        if self.update_interval != POLL_INTERVAL_ACTIVE:
+            self.update_interval = POLL_INTERVAL_ACTIVE
+            self._schedule_refresh()
+
+    def _next_update_interval(self) -> timedelta:
+        """Return the poll interval matching the current activity."""
+        now = time.monotonic()
+        if now < self._active_until:
+            return POLL_INTERVAL_ACTIVE
+        if (
+            self._state.get("STANDBY") != 2
+            or now - self._last_change > IDLE_AFTER.total_seconds()
+        ):
+            return POLL_INTERVAL_IDLE
+        return POLL_INTERVAL
 
     async def _async_update_data(self) -> dict[str, Any]:
         """Fetch data from the device."""
+        if self.connection.idle:
+            # Link was dropped on purpose, it comes back with the next command
+            return self._state
+
+        start = time.monotonic()
+        self._refreshing = True
         try:
-            if not self.device.is_connected:
-                _LOGGER.debug("Device not connected, attempting to reconnect")
-                await self.device.connect(self.ble_device)
+            await self.connection.ensure_connected()
+
+            if self._full_read_needed:
+                if not self._identity_read:
+                    await self._async_read_identity()
+                # Preset names only change through the app, read them once per connection
+                await self.device.get_full_settings(
+                    include_presets=not self._preset_names_read
+                )
+                self._full_read_needed = False
+                self._preset_names_read = True
+                if self.stale:
+                    self.stale = False
+                    self.async_update_listeners()
+                # Connect, sync, release when other subwoofers wait for the slot
+                await self.connection.async_yield_if_contended()
+            elif time.monotonic() < self._active_until:
+                await self.device.get_full_settings(include_presets=False)
+            else:
+                # Changes are pushed, just check the link is still alive
+                await self.device.probe()
 
-            # Request full settings
-            await self.device.get_full_settings()
+            self.update_interval = self._next_update_interval()
+            self.device.telemetry.record_poll(time.monotonic() - start)
+            if self._reload_needed:
+                # Runs after this refresh returned, never from inside it
+                self._reload_needed = False
+                self.hass.async_create_task(
+                    self.hass.config_entries.async_reload(self.entry.entry_id)
+                )
 
             # Return current state (updates come via notifications)
             return self._state
 
+        except CommandCancelled:
+            # Dropped for a user write, its echo carries the new values, the
+            # rest of the sync runs on the next poll
+            return self._state
         except BleakError as err:
             _LOGGER.warning("Error communicating with device: %s", err)
-            # Try to reconnect on next update
+            self.device.telemetry.poll_failures += 1
+            self._full_read_needed = True
             try:
-                await self.device.disconnect()
+                await self.connection.async_disconnect()
             except Exception:
                 pass
+            self.connection.async_schedule_reconnect()
             raise UpdateFailed(f"Error communicating with device: {err}") from err
+        finally:
+            self._refreshing = False
+
+    async def _async_read_identity(self) -> None:
+        """Read model and firmware once per connection and cache them in the entry."""
+        try:
+            identity = await self.device.read_identity(timeout=IDENTITY_TIMEOUT, retries=0)
+        except CommandCancelled:
+            # Dropped for a user write, read again with the rest of the sync
+            raise
+        except BleakError as err:
+            # Not every firmware may answer, the cached identity stays in use
+            self._identity_read = True
+            _LOGGER.debug("Could not read identity of %s: %s", self.device.address, err)
+            return
+
+        self._identity_read = True
+        data = dict(self.entry.data)
+        if "MODEL" in identity:
+            data[CONF_MODEL] = identity["MODEL"]
+        if "FIRMWARE" in identity:
+            data[CONF_FIRMWARE] = identity["FIRMWARE"]
+        if data == self.entry.data:
+            return
+
+        _LOGGER.debug("Identity of %s: %s", self.device.address, identity)
+        self.hass.config_entries.async_update_entry(self.entry, data=data)
+        registry = dr.async_get(self.hass)
+        if device := registry.async_get_device(identifiers={(DOMAIN, self.device.address)}):
+            registry.async_update_device(
+                device.id, model=data.get(CONF_MODEL), sw_version=data.get(CONF_FIRMWARE)
+            )
+        capabilities = MODEL_CAPABILITIES.get(data.get(CONF_MODEL), DEFAULT_CAPABILITIES)
+        if capabilities is not self.capabilities:
+            # Entities depend on the capabilities, set the entry up again.
+            # Until then only the layout the model answers with is read.
+            self.capabilities = capabilities
+            self.device.settings = capabilities["settings"]
+            self._reload_needed = True
 
     async def async_shutdown(self) -> None:
         """Shutdown the coordinator."""
-        await self.device.disconnect()
+        await super().async_shutdown()
+        await self.connection.async_stop()
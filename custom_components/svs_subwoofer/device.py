@@ -2,9 +2,11 @@
 from __future__ import annotations
 
 import asyncio
-from binascii import crc_hqx, hexlify
+from binascii import hexlify
+from functools import partial
 import logging
-from typing import Any, Callable
+import time
+from typing import Any, Awaitable, Callable, Iterable
 
 from bleak import BleakClient
 from bleak.exc import BleakError
@@ -12,45 +14,180 @@ from bleak_retry_connector import BleakClientWithServiceCache, establish_connect
 
 from homeassistant.components import bluetooth
 
-from .const import CHAR_UUID, FRAME_PREAMBLE, SVS_FRAME_TYPES, SVS_PARAMS
+from .const import (
+    ATT_HEADER_SIZE,
+    CHAR_UUID,
+    DEFAULT_MTU,
+    READ_WINDOW,
+    REQUEST_RETRIES,
+    REQUEST_TIMEOUT,
+    WRITE_MIN_INTERVAL,
+)
+from .capture import DIRECTION_RX, DIRECTION_TX, SVSCapture
+from .protocol import (
+    FRAME_TYPE_BY_CODE,
+    PARAMS,
+    SUB_INFO_FIELDS,
+    FrameReassembler,
+    encode_memwrites,
+    svs_decode,
+    svs_decode_verified,
+    svs_encode,
+)
+from .scheduler import PRIORITY_BACKGROUND, PRIORITY_USER, SVSCommandScheduler
+from .telemetry import SVSTelemetry
 
 _LOGGER = logging.getLogger(__name__)
 
+# Opens the GATT connection, called like establish_connection without the client class
+Connector = Callable[..., Awaitable[BleakClient]]
+
 
 class SVSDevice:
     """Representation of an SVS Subwoofer device."""
 
-    def __init__(self, address: str) -> None:
+    def __init__(self, address: str, connector: Connector | None = None) -> None:
         """Initialize the device."""
         self.address = address
+        # Replaced by a simulated subwoofer in load tests
+        self._connector: Connector = connector or partial(
+            establish_connection, BleakClientWithServiceCache
+        )
         self._client: BleakClient | None = None
         self._callbacks: list[Callable[[dict[str, Any]], None]] = []
-        self._partial_frame = b''
-        self._sync = True
-        self._disconnect_timer: asyncio.TimerHandle | None = None
+        self._reassembler = FrameReassembler()
+        # Every GATT write goes through the scheduler, user writes first
+        self._scheduler = SVSCommandScheduler(address)
+        # Requests waiting for a response, keyed on (memory id, offset, size),
+        # or on the response frame type for requests without a memory range
+        self._pending: dict[
+            tuple[int, int, int] | str, list[asyncio.Future[dict[str, Any]]]
+        ] = {}
+        # Newest unsent value per continuous parameter, and the task sending them
+        self._latest: dict[str, tuple[Any, asyncio.Future[dict[str, Any]]]] = {}
+        self._latest_tasks: dict[str, asyncio.Task[None]] = {}
+        self._last_write: dict[str, float] = {}
+        # Monotonic time of the last notification received and frame written
+        self.last_rx = 0.0
+        self.last_tx = 0.0
+        self._connect_handler: Callable[[int], Awaitable[None]] | None = None
+        self._disconnect_callbacks: list[Callable[[], None]] = []
+        self.telemetry = SVSTelemetry()
+        # Raw bytes in both directions, only kept while capturing
+        self.capture: SVSCapture | None = None
+        # Negotiated ATT MTU, writes longer than it allows are split
+        self.mtu = DEFAULT_MTU
+        # Adapter or proxy the last connection went through, if known
+        self.source: str | None = None
+        # Settings block the model answers with, sealed models have no port tuning
+        self.settings = "FULL_SETTINGS"
 
     async def connect(self, ble_device: bluetooth.BLEDevice) -> None:
         """Connect to the device."""
         _LOGGER.debug("Connecting to SVS subwoofer at %s", self.address)
 
-        self._client = await establish_connection(
-            BleakClientWithServiceCache,
+        self._client = await self._connector(
             ble_device,
             self.address,
+            disconnected_callback=self._handle_disconnect,
             max_attempts=3,
         )
 
+        self.source = self._connected_source(ble_device)
+        self.mtu = self.telemetry.mtu = await self._negotiate_mtu()
+
         # Subscribe to notifications
+        self._reassembler.reset()
         await self._client.start_notify(CHAR_UUID, self._notification_handler)
-        _LOGGER.info("Connected to SVS subwoofer at %s", self.address)
+        self.last_rx = self.last_tx = time.monotonic()
+        self.telemetry.record_connected()
+        _LOGGER.info("Connected to SVS subwoofer at %s (MTU %d)", self.address, self.mtu)
+
+    def _connected_source(self, ble_device: bluetooth.BLEDevice) -> str | None:
+        """Return the adapter or proxy the client connected through, None if unknown."""
+        # Home Assistant's client wrapper picks the best scanner itself, which need
+        # not be the one the device was passed for, and only records it privately
+        scanner = getattr(self._client, "_connected_scanner", None)
+        if (source := getattr(scanner, "source", None)) is not None:
+            return source
+        details = getattr(ble_device, "details", None)
+        return details.get("source") if isinstance(details, dict) else None
+
+    async def _negotiate_mtu(self) -> int:
+        """Ask for the largest MTU the backend can negotiate and return the result."""
+        # Only BlueZ exchanges the MTU on request, proxies negotiate it on connect.
+        # Bleak has no public call for it, without one BlueZ reports the default
+        # MTU and every long frame is split, so the private backend call is used.
+        acquire_mtu = getattr(getattr(self._client, "_backend", None), "_acquire_mtu", None)
+        if acquire_mtu is not None:
+            try:
+                await acquire_mtu()
+            except Exception as err:  # noqa: BLE001
+                # A private call may fail in any way, the default MTU always works
+                _LOGGER.debug("Could not negotiate MTU with %s: %s", self.address, err)
+                return DEFAULT_MTU
+        return getattr(self._client, "mtu_size", None) or DEFAULT_MTU
 
     async def disconnect(self) -> None:
         """Disconnect from the device."""
-        if self._client and self._client.is_connected:
-            await self._client.stop_notify(CHAR_UUID)
-            await self._client.disconnect()
+        self._scheduler.cancel_all()
+        self._fail_pending(BleakError("Device disconnected"))
+        # Cleared first so the disconnected callback ignores an intentional disconnect
+        client, self._client = self._client, None
+        self.telemetry.record_disconnected()
+        if client and client.is_connected:
+            await client.stop_notify(CHAR_UUID)
+            await client.disconnect()
             _LOGGER.info("Disconnected from SVS subwoofer at %s", self.address)
+
+    def _handle_disconnect(self, client: BleakClient) -> None:
+        """Handle the link to the device dropping unexpectedly."""
+        if client is not self._client:
+            return
+        _LOGGER.warning("Lost connection to SVS subwoofer at %s", self.address)
         self._client = None
+        self.telemetry.record_disconnected()
+        self._scheduler.cancel_all()
+        self._fail_pending(BleakError("Device disconnected"))
+        for callback in self._disconnect_callbacks:
+            callback()
+
+    def set_connect_handler(self, handler: Callable[[int], Awaitable[None]]) -> None:
+        """Set the coroutine used to connect on demand before a request."""
+        self._connect_handler = handler
+
+    def set_capture(self, enabled: bool) -> None:
+        """Start or stop capturing raw frames."""
+        if not enabled:
+            self.capture = None
+        elif self.capture is None:
+            self.capture = SVSCapture()
+
+    def register_disconnect_callback(self, callback: Callable[[], None]) -> None:
+        """Register a callback for unexpected disconnects."""
+        self._disconnect_callbacks.append(callback)
+
+    @property
+    def busy(self) -> bool:
+        """Return True if requests are queued or waiting for a response."""
+        return bool(self._pending or self._latest or self._scheduler.queue_depth)
+
+    @property
+    def scheduler(self) -> SVSCommandScheduler:
+        """Return the command scheduler of the device."""
+        return self._scheduler
+
+    @property
+    def statistics(self) -> dict[str, Any]:
+        """Return link, reassembly and queue statistics."""
+        reassembler = self._reassembler
+        return {
+            **self.telemetry.as_dict(),
+            "frames": reassembler.frames,
+            "crc_failures": reassembler.crc_failures,
+            "dropped_bytes": reassembler.dropped_bytes,
+            "scheduler": self._scheduler.statistics,
+        }
 
     @property
     def is_connected(self) -> bool:
@@ -63,226 +200,274 @@ class SVSDevice:
 
     def _notification_handler(self, handle: int, data: bytearray) -> None:
         """Handle notifications from the device."""
-        # Build frame from fragments
-        if data[0] == int.from_bytes(FRAME_PREAMBLE, 'little'):
-            # Detected frame start
-            if not self._sync:
-                _LOGGER.warning(
-                    "Frame fragment out of sync: %s",
-                    hexlify(self._partial_frame).decode("utf-8")
-                )
-            self._partial_frame = bytes(data)
-        else:
-            # Detected frame fragment
-            self._partial_frame = self._partial_frame + bytes(data)
-
-        # Try to decode the frame
-        decoded_frame = self._svs_decode(self._partial_frame)
-        self._sync = decoded_frame["FRAME_RECOGNIZED"]
+        self.last_rx = time.monotonic()
+        if self.capture is not None:
+            self.capture.record(DIRECTION_RX, data)
+        reassembler = self._reassembler
+        dropped = reassembler.dropped_bytes
+        telemetry = self.telemetry
+        telemetry.record_notification(self.last_rx, not reassembler.pending)
+        frames = reassembler.feed(data)
+
+        if reassembler.dropped_bytes != dropped:
+            telemetry.out_of_sync += 1
+            _LOGGER.warning(
+                "Frame fragment out of sync, dropped %d bytes: %s",
+                reassembler.dropped_bytes - dropped,
+                hexlify(data).decode("utf-8"),
+            )
 
-        if self._sync:
+        for frame in frames:
+            # The reassembler only returns frames that passed the CRC check
+            decoded_frame = svs_decode_verified(frame)
+            telemetry.record_frame(decoded_frame.get("FRAME_TYPE", "UNKNOWN"))
             validated_values = decoded_frame.get("VALIDATED_VALUES", {})
+            frame_type = decoded_frame.get("FRAME_TYPE")
+            if frame_type in ("READ_RESP", "MEMWRITE"):
+                self._resolve_pending(decoded_frame["MEMORY"], validated_values)
+            elif frame_type in SUB_INFO_FIELDS:
+                self._resolve_pending(frame_type, validated_values)
             if validated_values:
                 _LOGGER.debug("Received: %s", validated_values)
                 # Notify all callbacks
                 for callback in self._callbacks:
                     callback(validated_values)
 
-    async def get_full_settings(self) -> dict[str, Any]:
-        """Request full settings from the device."""
+    async def read(
+        self,
+        param: str,
+        response: bool = True,
+        priority: int = PRIORITY_BACKGROUND,
+    ) -> dict[str, Any]:
+        """Read a parameter and return the values the device answered with."""
+        frame, _ = self._svs_encode("MEMREAD", param)
+        if not frame:
+            return {}
+        return await self._request(
+            frame, PARAMS[param].memory, response=response, priority=priority
+        )
+
+    async def read_many(
+        self,
+        params: Iterable[str],
+        window: int = READ_WINDOW,
+        response: bool = True,
+        priority: int = PRIORITY_BACKGROUND,
+    ) -> dict[str, Any]:
+        """Read several parameters with up to window requests in flight."""
+        semaphore = asyncio.Semaphore(window)
+
+        async def _read(param: str) -> dict[str, Any]:
+            async with semaphore:
+                return await self.read(param, response=response, priority=priority)
+
+        values: dict[str, Any] = {}
+        for result in await asyncio.gather(*(_read(param) for param in params)):
+            values.update(result)
+        return values
+
+    async def write(self, param: str, value: Any) -> dict[str, Any]:
+        """Write a parameter and return the values the device confirmed."""
+        frame, _ = self._svs_encode("MEMWRITE", param, value)
+        if not frame:
+            return {}
+        # Queued polls would only read values the write is about to change
+        self._scheduler.cancel_background()
+        return await self._request(frame, PARAMS[param].memory, priority=PRIORITY_USER)
+
+    async def set_many(self, values: dict[str, Any]) -> dict[str, Any]:
+        """Write several parameters using as few contiguous MEMWRITE frames as possible."""
+        writes = encode_memwrites(values)
+        self._scheduler.cancel_background()
+        confirmed: dict[str, Any] = {}
+        for result in await asyncio.gather(
+            *(
+                self._request(frame, memory, priority=PRIORITY_USER)
+                for memory, frame in writes
+            )
+        ):
+            confirmed.update(result)
+        _LOGGER.debug("Set %s in %d frames", values, len(writes))
+        return confirmed
+
+    async def write_latest(self, param: str, value: Any) -> dict[str, Any]:
+        """Write a parameter, dropping any value superseded before it is sent."""
+        # Callers whose value was superseded get the result of the newer write
+        queued = self._latest.get(param)
+        future = queued[1] if queued else asyncio.get_running_loop().create_future()
+        self._latest[param] = (value, future)
+        if param not in self._latest_tasks:
+            self._latest_tasks[param] = asyncio.create_task(
+                self._write_latest_loop(param)
+            )
+        return await asyncio.shield(future)
+
+    async def _write_latest_loop(self, param: str) -> None:
+        """Send the newest queued value of a parameter until none is left."""
+        try:
+            while param in self._latest:
+                delay = self._last_write.get(param, 0.0) + WRITE_MIN_INTERVAL - time.monotonic()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                value, future = self._latest.pop(param)
+                self._last_write[param] = time.monotonic()
+                try:
+                    result = await self.write(param, value)
+                except Exception as err:  # noqa: BLE001
+                    if not future.done():
+                        future.set_exception(err)
+                else:
+                    if not future.done():
+                        future.set_result(result)
+        finally:
+            self._latest_tasks.pop(param, None)
+
+    async def _request(
+        self,
+        frame: bytes,
+        key: tuple[int, int, int] | str,
+        timeout: float = REQUEST_TIMEOUT,
+        retries: int = REQUEST_RETRIES,
+        response: bool = True,
+        priority: int = PRIORITY_BACKGROUND,
+    ) -> dict[str, Any]:
+        """Send a frame and wait for the response covering the same memory, or of the keyed type."""
+        if not self.is_connected and self._connect_handler is not None:
+            await self._connect_handler(priority)
+
+        loop = asyncio.get_running_loop()
+        ftype = FRAME_TYPE_BY_CODE.get(frame[1:3], "UNKNOWN")
+        for attempt in range(retries + 1):
+            if not self.is_connected:
+                raise BleakError("Device not connected")
+
+            future: asyncio.Future[dict[str, Any]] = loop.create_future()
+            waiters = self._pending.setdefault(key, [])
+            waiters.append(future)
+            try:
+                sent_at = await self._scheduler.run(
+                    partial(self._write_frame, frame, response), priority
+                )
+                async with asyncio.timeout(timeout):
+                    result = await future
+                self.telemetry.record_round_trip(ftype, time.monotonic() - sent_at)
+                return result
+            except TimeoutError:
+                self.telemetry.record_timeout(ftype)
+                _LOGGER.debug(
+                    "No response for %s from %s (attempt %d)",
+                    key, self.address, attempt + 1,
+                )
+            finally:
+                if future in waiters:
+                    waiters.remove(future)
+                # Failed by a disconnect while the write itself failed, already raised
+                if future.done() and not future.cancelled():
+                    future.exception()
+                if not waiters:
+                    self._pending.pop(key, None)
+
+        raise BleakError(f"No response for {key} after {retries + 1} attempts")
+
+    async def _write_frame(self, frame: bytes, response: bool) -> float:
+        """Write a frame and return when it was sent, only called by the command scheduler."""
+        if not self.is_connected:
+            raise BleakError("Device not connected")
+        self.last_tx = time.monotonic()
+        if self.capture is not None:
+            self.capture.record(DIRECTION_TX, frame)
+        size = self.mtu - ATT_HEADER_SIZE
+        if len(frame) <= size:
+            await self._client.write_gatt_char(CHAR_UUID, frame, response=response)
+            return self.last_tx
+
+        # Pieces go out back to back in one command, the device reassembles them
+        self.telemetry.split_writes += 1
+        for start in range(0, len(frame), size):
+            await self._client.write_gatt_char(
+                CHAR_UUID, frame[start:start + size], response=response
+            )
+        return self.last_tx
+
+    def _resolve_pending(self, key: tuple[int, int, int] | str, values: dict[str, Any]) -> None:
+        """Resolve every request waiting for a memory range or response type."""
+        for future in self._pending.pop(key, ()):
+            if not future.done():
+                future.set_result(values)
+
+    def _fail_pending(self, err: Exception) -> None:
+        """Fail every outstanding request."""
+        pending, self._pending = self._pending, {}
+        for waiters in pending.values():
+            for future in waiters:
+                if not future.done():
+                    future.set_exception(err)
+
+    async def get_full_settings(self, include_presets: bool = True) -> dict[str, Any]:
+        """Read the settings block, and optionally the preset names, in one pipelined batch."""
+        params = [self.settings]
+        if include_presets:
+            params += ["PRESET1NAME", "PRESET2NAME", "PRESET3NAME"]
+
+        return await self.read_many(params)
+
+    async def read_identity(
+        self, timeout: float = REQUEST_TIMEOUT, retries: int = REQUEST_RETRIES
+    ) -> dict[str, str]:
+        """Ask the device for its model and firmware version."""
+        identity: dict[str, str] = {}
+        for ftype in ("SUB_INFO1", "SUB_INFO2"):
+            # Every parameter encodes the same SUB_INFO request
+            frame, _ = self._svs_encode(ftype, "FULL_SETTINGS")
+            identity.update(
+                await self._request(frame, f"{ftype}_RESP", timeout=timeout, retries=retries)
+            )
+        return identity
+
+    async def preset_action(self, param: str) -> dict[str, Any]:
+        """Load or save a device preset slot, a load returns the settings it restored."""
+        frame, _ = self._svs_encode("PRESETLOADSAVE", param)
+        if not frame:
+            return {}
+        if not self.is_connected and self._connect_handler is not None:
+            await self._connect_handler(PRIORITY_USER)
         if not self.is_connected:
             raise BleakError("Device not connected")
 
-        # Request all settings
-        frames = [
-            self._svs_encode("MEMREAD", "FULL_SETTINGS")[0],
-            self._svs_encode("MEMREAD", "PRESET1NAME")[0],
-            self._svs_encode("MEMREAD", "PRESET2NAME")[0],
-            self._svs_encode("MEMREAD", "PRESET3NAME")[0],
-        ]
-
-        for frame in frames:
-            if frame:
-                await self._client.write_gatt_char(CHAR_UUID, frame)
-                await asyncio.sleep(0.2)
-
-        # Wait a bit for responses
-        await asyncio.sleep(1)
+        await self._scheduler.run(partial(self._write_frame, frame, True), PRIORITY_USER)
+        if not param.endswith("LOAD"):
+            return {}
+        # A load only replaces the settings block, the preset names are untouched
+        return await self.read(self.settings, priority=PRIORITY_USER)
 
-        # Return empty dict - actual data comes through notifications
-        return {}
+    async def probe(self) -> None:
+        """Read a single small parameter to check the link is alive."""
+        await self.read("VOLUME")
 
     async def set_volume(self, volume: int) -> None:
         """Set volume level (-60 to 0 dB)."""
-        if not self.is_connected:
-            raise BleakError("Device not connected")
-
-        frame, _ = self._svs_encode("MEMWRITE", "VOLUME", volume)
-        if frame:
-            await self._client.write_gatt_char(CHAR_UUID, frame)
+        if await self.write_latest("VOLUME", volume):
             _LOGGER.debug("Set volume to %d dB", volume)
 
     async def set_standby(self, mode: int) -> None:
         """Set standby mode (0=AUTO ON, 1=TRIGGER, 2=ON)."""
-        if not self.is_connected:
-            raise BleakError("Device not connected")
-
-        frame, _ = self._svs_encode("MEMWRITE", "STANDBY", mode)
-        if frame:
-            await self._client.write_gatt_char(CHAR_UUID, frame)
+        if await self.write("STANDBY", mode):
             _LOGGER.debug("Set standby mode to %d", mode)
 
     async def set_phase(self, phase: int) -> None:
         """Set phase (0-180 degrees)."""
-        if not self.is_connected:
-            raise BleakError("Device not connected")
-
-        frame, _ = self._svs_encode("MEMWRITE", "PHASE", phase)
-        if frame:
-            await self._client.write_gatt_char(CHAR_UUID, frame)
+        if await self.write_latest("PHASE", phase):
             _LOGGER.debug("Set phase to %d degrees", phase)
 
     async def set_polarity(self, polarity: int) -> None:
         """Set polarity (0=+, 1=-)."""
-        if not self.is_connected:
-            raise BleakError("Device not connected")
-
-        frame, _ = self._svs_encode("MEMWRITE", "POLARITY", polarity)
-        if frame:
-            await self._client.write_gatt_char(CHAR_UUID, frame)
+        if await self.write("POLARITY", polarity):
             _LOGGER.debug("Set polarity to %d", polarity)
 
     def _svs_encode(self, ftype: str, param: str, data: Any = "") -> tuple[bytes, str]:
         """Encode a frame for sending to the device."""
-        if ftype == "PRESETLOADSAVE" and SVS_PARAMS[param]["id"] >= 0x18:
-            frame = (
-                SVS_PARAMS[param]["id"].to_bytes(4, "little") +
-                SVS_PARAMS[param]["offset"].to_bytes(2, "little") +
-                SVS_PARAMS[param]["n_bytes"].to_bytes(2, "little")
-            )
-        elif ftype == "MEMWRITE" and SVS_PARAMS[param]["id"] <= 0xA and SVS_PARAMS[param]["limits_type"] != "group":
-            if isinstance(data, str) and len(data) > 0 and SVS_PARAMS[param]["limits_type"] == 2:
-                encoded_data = bytes(data.ljust(SVS_PARAMS[param]["n_bytes"], "\x00"), 'utf-8')[:SVS_PARAMS[param]["n_bytes"]]
-            elif isinstance(data, (int, float)):
-                if (SVS_PARAMS[param]["limits_type"] == 1 and data in SVS_PARAMS[param]["limits"]) or \
-                   (SVS_PARAMS[param]["limits_type"] == 0 and max(SVS_PARAMS[param]["limits"]) >= data >= min(SVS_PARAMS[param]["limits"])):
-                    mask = 0 if data >= 0 else 0xFFFF
-                    encoded_data = ((int(10 * abs(data)) ^ mask) + (mask % 2)).to_bytes(2, 'little')
-                else:
-                    _LOGGER.error("Value for %s out of limits", param)
-                    return (b'', "")
-            else:
-                _LOGGER.error("Value for %s incorrect", param)
-                return (b'', "")
-
-            frame = (
-                SVS_PARAMS[param]["id"].to_bytes(4, "little") +
-                SVS_PARAMS[param]["offset"].to_bytes(2, "little") +
-                SVS_PARAMS[param]["n_bytes"].to_bytes(2, "little") +
-                encoded_data
-            )
-        elif ftype == "MEMREAD" and SVS_PARAMS[param]["id"] <= 0xA:
-            frame = (
-                SVS_PARAMS[param]["id"].to_bytes(4, "little") +
-                SVS_PARAMS[param]["offset"].to_bytes(2, "little") +
-                SVS_PARAMS[param]["n_bytes"].to_bytes(2, "little")
-            )
-        elif ftype == "RESET" and SVS_PARAMS[param]["id"] <= 0xA:
-            frame = SVS_PARAMS[param]["reset_id"].to_bytes(1, "little")
-        elif ftype in ["SUB_INFO1", "SUB_INFO2", "SUB_INFO3"]:
-            frame = b'\x00'
-        else:
-            _LOGGER.error("Unknown frame type to encode: %s", ftype)
-            return (b'', "")
-
-        frame = FRAME_PREAMBLE + SVS_FRAME_TYPES[ftype] + (len(frame) + 7).to_bytes(2, "little") + frame
-        frame = frame + crc_hqx(frame, 0).to_bytes(2, 'little')
-        meta = f"{ftype} {[param]} {str(data) if data else ''}"
-        return (frame, meta)
+        return svs_encode(ftype, param, data)
 
     def _svs_decode(self, frame: bytes) -> dict[str, Any]:
         """Decode a frame received from the device."""
-        output: dict[str, Any] = {}
-
-        if len(frame) < 5:
-            return {"FRAME_RECOGNIZED": False}
-
-        # Validate frame
-        crc_received = frame[-2:]
-        crc_calculated = crc_hqx(frame[:-2], 0).to_bytes(2, 'little')
-        frame_length = int.from_bytes(frame[3:5], 'little')
-
-        recognized = (
-            frame[0] == int.from_bytes(FRAME_PREAMBLE, 'little') and
-            frame_length == len(frame) and
-            crc_received == crc_calculated
-        )
-
-        output["FRAME_RECOGNIZED"] = recognized
-
-        if not recognized:
-            return output
-
-        # Identify frame type
-        frame_type = None
-        for key, value in SVS_FRAME_TYPES.items():
-            if value == frame[1:3]:
-                frame_type = key
-                break
-
-        if not frame_type:
-            return output
-
-        output["FRAME_TYPE"] = frame_type
-        output["VALIDATED_VALUES"] = {}
-
-        # Parse frame based on type
-        if frame_type in ["MEMWRITE", "MEMREAD", "READ_RESP"]:
-            id_position = 9 if frame_type == "READ_RESP" else 5
-            param_id = int.from_bytes(frame[id_position:id_position + 4], 'little')
-            mem_start = int.from_bytes(frame[id_position + 4:id_position + 6], 'little')
-            mem_size = int.from_bytes(frame[id_position + 6:id_position + 8], 'little')
-
-            # Read attributes and data
-            attributes = []
-            for offset in range(0, mem_size, 2):
-                for key, value in SVS_PARAMS.items():
-                    if value["limits_type"] != "group" and value["id"] == param_id:
-                        if (mem_start + offset) == value["offset"]:
-                            attributes.append(key)
-                            break
-                        elif (mem_start + offset) >= value["offset"] and \
-                             (mem_start + offset) < (value["offset"] + value["n_bytes"]):
-                            break
-
-            # Decode data
-            if frame_type != "MEMREAD" and attributes:
-                data_start = id_position + 8
-                for attrib in attributes:
-                    param_info = SVS_PARAMS[attrib]
-                    data_bytes = frame[data_start:data_start + param_info["n_bytes"]]
-
-                    if param_info["limits_type"] == 2:
-                        # String type
-                        value = data_bytes.decode("utf-8").rstrip('\x00')
-                        output["VALIDATED_VALUES"][attrib] = value
-                    else:
-                        # Numeric type
-                        raw_value = int.from_bytes(data_bytes, 'little')
-                        mask = 0 if raw_value < 0xf000 else 0xFFFF
-                        value = ((-1)**(mask % 2)) * ((raw_value - (mask % 2)) ^ mask) / 10
-
-                        # Validate limits
-                        if param_info["limits_type"] == 1:
-                            check = value in param_info["limits"]
-                        elif param_info["limits_type"] == 0:
-                            check = max(param_info["limits"]) >= value >= min(param_info["limits"])
-                        else:
-                            check = False
-
-                        if check:
-                            output["VALIDATED_VALUES"][attrib] = int(value) if ".0" in str(value) else value
-
-                    data_start += param_info["n_bytes"]
-
-        return output
+        return svs_decode(frame)
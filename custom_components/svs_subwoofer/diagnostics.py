@@ -0,0 +1,45 @@
+"""Diagnostics support for SVS Subwoofer."""
+from __future__ import annotations
+
+from base64 import b64encode
+from typing import Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import CONF_ADDRESS
+from homeassistant.core import HomeAssistant
+
+from .const import DOMAIN
+from .coordinator import SVSCoordinator
+
+# The unique id and title carry the Bluetooth address too
+TO_REDACT = {CONF_ADDRESS, "unique_id", "title"}
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    coordinator: SVSCoordinator = hass.data[DOMAIN][entry.entry_id]
+    connection = coordinator.connection
+    capture = coordinator.device.capture
+    return {
+        "entry": async_redact_data(entry.as_dict(), TO_REDACT),
+        "state": dict(coordinator.data),
+        "stale": coordinator.stale,
+        "connection": {
+            "connected": coordinator.device.is_connected,
+            "idle": connection.idle,
+            "yielded": connection.yielded,
+            "reconnects": connection.reconnects,
+        },
+        "telemetry": coordinator.device.statistics,
+        # Replay with benchmarks/replay.py, which reads this file directly
+        "capture": None
+        if capture is None
+        else {
+            "records": len(capture),
+            "dropped": capture.dropped,
+            "data": b64encode(capture.export()).decode("ascii"),
+        },
+    }
@@ -0,0 +1,66 @@
+"""Base entity for SVS Subwoofer."""
+from __future__ import annotations
+
+from homeassistant.const import CONF_ADDRESS
+from homeassistant.core import callback
+from homeassistant.helpers.device_registry import DeviceInfo
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
+
+from .const import CONF_FIRMWARE, CONF_MODEL, DOMAIN
+from .coordinator import SVSCoordinator
+
+
+class SVSEntity(CoordinatorEntity[SVSCoordinator]):
+    """Base class for SVS entities that render a fixed set of state keys."""
+
+    # State keys the entity renders, it is only updated when one of them changes
+    _svs_keys: tuple[str, ...] = ()
+
+    def __init__(self, coordinator: SVSCoordinator) -> None:
+        """Initialize the entity."""
+        super().__init__(coordinator)
+        self._last_status: tuple[bool, bool] | None = None
+        data = coordinator.entry.data
+        address = data[CONF_ADDRESS]
+        # Model and firmware are read from the device, unknown until the first connection
+        self._attr_device_info = DeviceInfo(
+            identifiers={(DOMAIN, address)},
+            name=f"SVS Subwoofer {address[-5:]}",
+            manufacturer="SVS",
+            model=data.get(CONF_MODEL),
+            sw_version=data.get(CONF_FIRMWARE),
+            connections={("bluetooth", address)},
+        )
+
+    @property
+    def available(self) -> bool:
+        """Return True if entity is available."""
+        coordinator = self.coordinator
+        # A link dropped for being idle, or to hand the slot to another
+        # subwoofer, comes back with the next command
+        connection = coordinator.connection
+        return super().available and (
+            coordinator.device.is_connected
+            or coordinator.stale
+            or connection.idle
+            or connection.yielded
+        )
+
+    async def async_added_to_hass(self) -> None:
+        """Subscribe to changes of the rendered keys."""
+        await super().async_added_to_hass()
+        self._last_status = (self.available, self.coordinator.stale)
+        self.async_on_remove(
+            self.coordinator.async_add_key_listener(
+                self._svs_keys, self.async_write_ha_state
+            )
+        )
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Write state when availability or staleness changed, values use key listeners."""
+        status = (self.available, self.coordinator.stale)
+        if status == self._last_status:
+            return
+        self._last_status = status
+        self.async_write_ha_state()
@@ -13,10 +13,10 @@ from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import CONF_ADDRESS
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from .const import DOMAIN, STANDBY_MODES
 from .coordinator import SVSCoordinator
+from .entity import SVSEntity
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -31,7 +31,7 @@ async def async_setup_entry(
     async_add_entities([SVSMediaPlayer(coordinator, entry)])
 
 
-class SVSMediaPlayer(CoordinatorEntity[SVSCoordinator], MediaPlayerEntity):
+class SVSMediaPlayer(SVSEntity, MediaPlayerEntity):
     """Representation of an SVS Subwoofer as a media player."""
 
     _attr_has_entity_name = True
@@ -40,23 +40,20 @@ class SVSMediaPlayer(CoordinatorEntity[SVSCoordinator], MediaPlayerEntity):
         MediaPlayerEntityFeature.VOLUME_SET
         | MediaPlayerEntityFeature.VOLUME_STEP
     )
+    _svs_keys = (
+        "VOLUME",
+        "STANDBY",
+        "PHASE",
+        "POLARITY",
+        "LOW_PASS_FILTER_ENABLE",
+        "LOW_PASS_FILTER_FREQ",
+        "ROOM_GAIN_ENABLE",
+    )
 
     def __init__(self, coordinator: SVSCoordinator, entry: ConfigEntry) -> None:
         """Initialize the media player."""
         super().__init__(coordinator)
         self._attr_unique_id = entry.data[CONF_ADDRESS]
-        self._attr_device_info = {
-            "identifiers": {(DOMAIN, entry.data[CONF_ADDRESS])},
-            "name": f"SVS Subwoofer {entry.data[CONF_ADDRESS][-5:]}",
-            "manufacturer": "SVS",
-            "model": "SB-1000 Pro",
-            "connections": {("bluetooth", entry.data[CONF_ADDRESS])},
-        }
-
-    @property
-    def available(self) -> bool:
-        """Return True if entity is available."""
-        return self.coordinator.device.is_connected and super().available
 
     @property
     def state(self) -> MediaPlayerState:
@@ -81,7 +78,7 @@ class SVSMediaPlayer(CoordinatorEntity[SVSCoordinator], MediaPlayerEntity):
         """Set volume level (0.0 to 1.0)."""
         # Convert Home Assistant range to SVS range (-60 to 0 dB)
         svs_volume = int((volume * 60) - 60)
-        await self.coordinator.device.set_volume(svs_volume)
+        await self.coordinator.async_set_value("VOLUME", svs_volume)
 
     async def async_volume_up(self) -> None:
         """Volume up the media player."""
@@ -125,4 +122,7 @@ class SVSMediaPlayer(CoordinatorEntity[SVSCoordinator], MediaPlayerEntity):
         if "VOLUME" in data:
             attributes["volume_db"] = data["VOLUME"]
 
+        if self.coordinator.stale:
+            attributes["stale"] = True
+
         return attributes
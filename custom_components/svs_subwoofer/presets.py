@@ -0,0 +1,59 @@
+"""Local preset library for SVS Subwoofer."""
+from __future__ import annotations
+
+import logging
+from typing import Any
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.storage import Store
+
+from .const import DOMAIN, STORAGE_VERSION
+from .protocol import PARAMS
+
+_LOGGER = logging.getLogger(__name__)
+
+# Settings captured in a snapshot: every writable value of the settings block
+SNAPSHOT_PARAMS: tuple[str, ...] = tuple(
+    name for name, spec in PARAMS.items() if spec.mem_id == 4 and not spec.is_group
+)
+
+
+def presets_store(hass: HomeAssistant, entry_id: str) -> Store[dict[str, Any]]:
+    """Return the store holding the snapshots of a config entry."""
+    return Store(hass, STORAGE_VERSION, f"{DOMAIN}.{entry_id}.presets")
+
+
+class SVSPresetLibrary:
+    """Named setting snapshots of one subwoofer, stored in Home Assistant."""
+
+    def __init__(self, hass: HomeAssistant, entry_id: str) -> None:
+        """Initialize an empty library."""
+        self._store = presets_store(hass, entry_id)
+        self._presets: dict[str, dict[str, Any]] = {}
+
+    @property
+    def names(self) -> list[str]:
+        """Return the snapshot names in the order they were saved."""
+        return list(self._presets)
+
+    def get(self, name: str) -> dict[str, Any] | None:
+        """Return the settings of a snapshot, None if there is none by that name."""
+        return self._presets.get(name)
+
+    async def async_load(self) -> None:
+        """Load the stored snapshots."""
+        if stored := await self._store.async_load():
+            self._presets = stored["presets"]
+
+    async def async_save(self, name: str, settings: dict[str, Any]) -> None:
+        """Store a snapshot, replacing any with the same name."""
+        self._presets[name] = dict(settings)
+        await self._store.async_save({"presets": self._presets})
+        _LOGGER.debug("Saved preset %s: %s", name, settings)
+
+    async def async_delete(self, name: str) -> bool:
+        """Remove a snapshot, return False if there is none by that name."""
+        if self._presets.pop(name, None) is None:
+            return False
+        await self._store.async_save({"presets": self._presets})
+        return True
@@ -0,0 +1,427 @@
+"""SVS Subwoofer protocol schema and frame codec."""
+from __future__ import annotations
+
+from binascii import crc_hqx
+from functools import lru_cache
+import logging
+from math import ceil, floor
+import struct
+from typing import Any, Final
+
+from .const import FRAME_PREAMBLE, SVS_FRAME_TYPES, SVS_PARAMS
+
+_LOGGER = logging.getLogger(__name__)
+
+PREAMBLE_BYTE: Final = FRAME_PREAMBLE[0]
+
+# Highest memory id that can be read or written, preset load/save ids start above
+MAX_MEMORY_ID: Final = 0xA
+PRESET_ACTION_ID: Final = 0x18
+
+# Header and CRC around the payload
+MIN_FRAME_LENGTH: Final = 7
+# READ_RESP frames carry four bytes before the memory address
+READ_RESP_PREFIX_LENGTH: Final = 4
+
+# Distinct (parameter, value) MEMWRITE frames kept encoded
+MEMWRITE_CACHE_SIZE: Final = 512
+
+
+def decode_word(raw_value: int) -> float:
+    """Decode a 16-bit word holding a value scaled by ten."""
+    if raw_value < 0xF000:
+        return raw_value / 10
+    return (raw_value - 0x10000) / 10
+
+
+class SVSParam:
+    """Compiled description of a single SVS parameter."""
+
+    __slots__ = (
+        "name",
+        "mem_id",
+        "offset",
+        "n_bytes",
+        "end",
+        "limits",
+        "limits_type",
+        "reset_id",
+        "is_group",
+        "allowed",
+        "low",
+        "high",
+        "address",
+        "memory",
+        "words",
+    )
+
+    def __init__(self, name: str, spec: dict[str, Any]) -> None:
+        """Compile the raw parameter description."""
+        self.name: str = name
+        self.mem_id: int = spec["id"]
+        self.offset: int = spec["offset"]
+        self.n_bytes: int = spec["n_bytes"]
+        self.end: int = self.offset + self.n_bytes
+        self.limits: list[Any] = spec["limits"]
+        self.limits_type: int | str = spec["limits_type"]
+        self.reset_id: int = spec["reset_id"]
+        self.is_group: bool = self.limits_type == "group"
+        self.allowed: frozenset[float] = frozenset()
+        self.low: float = 0
+        self.high: float = 0
+        if self.limits_type == 1:
+            self.allowed = frozenset(self.limits)
+        elif self.limits_type == 0:
+            self.low = min(self.limits)
+            self.high = max(self.limits)
+        # id, offset and size as sent in MEMREAD/MEMWRITE/PRESETLOADSAVE frames
+        self.address: bytes = (
+            self.mem_id.to_bytes(4, "little")
+            + self.offset.to_bytes(2, "little")
+            + self.n_bytes.to_bytes(2, "little")
+        )
+        self.memory: tuple[int, int, int] = (self.mem_id, self.offset, self.n_bytes)
+        # Raw 16-bit word to validated value, for numeric parameters
+        self.words: dict[int, float] = {}
+        if self.limits_type in (0, 1) and self.n_bytes == 2:
+            low = min(self.limits) if self.limits_type == 1 else self.low
+            high = max(self.limits) if self.limits_type == 1 else self.high
+            for scaled in range(floor(low * 10) - 1, ceil(high * 10) + 2):
+                raw_value = scaled & 0xFFFF
+                value = decode_word(raw_value)
+                if self.in_limits(value):
+                    self.words[raw_value] = int(value) if value.is_integer() else value
+
+    def __repr__(self) -> str:
+        """Return the representation of the parameter."""
+        return f"SVSParam({self.name!r}, id={self.mem_id:#x}, offset={self.offset:#x})"
+
+    def in_limits(self, value: float) -> bool:
+        """Return True if a numeric value is within the parameter limits."""
+        if self.limits_type == 1:
+            return value in self.allowed
+        if self.limits_type == 0:
+            return self.high >= value >= self.low
+        return False
+
+
+PARAMS: Final[dict[str, SVSParam]] = {
+    name: SVSParam(name, spec) for name, spec in SVS_PARAMS.items()
+}
+
+# Every 2-byte word of readable memory mapped to the parameter covering it
+PARAM_INDEX: Final[dict[tuple[int, int], SVSParam]] = {
+    (param.mem_id, word): param
+    for param in PARAMS.values()
+    if not param.is_group
+    for word in range(param.offset, param.end, 2)
+}
+
+# The longest frame the device sends answers a read of the largest block. A
+# longer length header is corrupt, waiting for it would hold back valid frames.
+MAX_FRAME_LENGTH: Final = MIN_FRAME_LENGTH + READ_RESP_PREFIX_LENGTH + max(
+    len(param.address) + param.n_bytes for param in PARAMS.values()
+)
+
+FRAME_TYPE_BY_CODE: Final[dict[bytes, str]] = {
+    code: ftype for ftype, code in SVS_FRAME_TYPES.items()
+}
+
+
+class MemoryLayout:
+    """Precompiled fixed layout of a block of numeric 16-bit words."""
+
+    __slots__ = ("mem_id", "offset", "n_bytes", "_struct", "_fields")
+
+    def __init__(self, block: SVSParam) -> None:
+        """Compile the layout of a group parameter."""
+        self.mem_id = block.mem_id
+        self.offset = block.offset
+        self.n_bytes = block.n_bytes
+        fields = [PARAM_INDEX[(block.mem_id, word)] for word in range(block.offset, block.end, 2)]
+        if any(field.n_bytes != 2 or not field.words for field in fields):
+            raise ValueError(f"{block.name} is not a block of numeric words")
+        self._struct = struct.Struct(f"<{len(fields)}H")
+        self._fields = tuple((field.name, field.words) for field in fields)
+
+    def decode(self, frame: bytes, start: int) -> dict[str, Any]:
+        """Decode and validate every field of the block in one pass."""
+        values: dict[str, Any] = {}
+        for (name, words), raw_value in zip(self._fields, self._struct.unpack_from(frame, start)):
+            value = words.get(raw_value)
+            if value is not None:
+                values[name] = value
+        return values
+
+
+# Blocks decoded in one pass when read as a whole, keyed on (id, offset, size)
+LAYOUTS: Final[dict[tuple[int, int, int], MemoryLayout]] = {
+    (layout.mem_id, layout.offset, layout.n_bytes): layout
+    for layout in (
+        MemoryLayout(PARAMS["FULL_SETTINGS"]),
+        MemoryLayout(PARAMS["SEALED_SETTINGS"]),
+    )
+}
+
+# Identity field answered by each SUB_INFO request. The payload layout is not
+# documented, it is taken to be NUL padded ASCII, SUB_INFO3 is kept as hex.
+SUB_INFO_FIELDS: Final = {
+    "SUB_INFO1_RESP": "MODEL",
+    "SUB_INFO2_RESP": "FIRMWARE",
+    "SUB_INFO3_RESP": "SUB_INFO3",
+}
+
+
+def decode_sub_info(frame_type: str, payload: bytes) -> dict[str, str]:
+    """Decode the identity field carried by a SUB_INFO response."""
+    field = SUB_INFO_FIELDS[frame_type]
+    if frame_type == "SUB_INFO3_RESP":
+        return {field: payload.hex()}
+    text = payload.split(b"\x00", 1)[0].decode("ascii", "replace").strip()
+    return {field: text} if text else {}
+
+
+def encode_word(value: float) -> bytes:
+    """Encode a numeric value as a 16-bit word scaled by ten."""
+    mask = 0 if value >= 0 else 0xFFFF
+    return ((int(10 * abs(value)) ^ mask) + (mask % 2)).to_bytes(2, "little")
+
+
+def build_frame(ftype: str, payload: bytes) -> bytes:
+    """Wrap a payload with the frame header and CRC."""
+    frame = FRAME_PREAMBLE + SVS_FRAME_TYPES[ftype] + (len(payload) + 7).to_bytes(2, "little") + payload
+    return frame + crc_hqx(frame, 0).to_bytes(2, 'little')
+
+
+def _constant_frames() -> dict[tuple[str, str], bytes]:
+    """Build every frame whose content only depends on its type and parameter."""
+    frames: dict[tuple[str, str], bytes] = {}
+    for name, spec in PARAMS.items():
+        for ftype in ("SUB_INFO1", "SUB_INFO2", "SUB_INFO3"):
+            frames[(ftype, name)] = build_frame(ftype, b'\x00')
+        if spec.mem_id >= PRESET_ACTION_ID:
+            frames[("PRESETLOADSAVE", name)] = build_frame("PRESETLOADSAVE", spec.address)
+            continue
+        frames[("MEMREAD", name)] = build_frame("MEMREAD", spec.address)
+        if spec.reset_id >= 0:
+            frames[("RESET", name)] = build_frame("RESET", spec.reset_id.to_bytes(1, "little"))
+    return frames
+
+
+CONSTANT_FRAMES: Final[dict[tuple[str, str], bytes]] = _constant_frames()
+
+
+def encode_value(spec: SVSParam, data: str | float) -> bytes:
+    """Encode the memory content of a parameter, raising ValueError for invalid values."""
+    if isinstance(data, str) and len(data) > 0 and spec.limits_type == 2:
+        return bytes(data.ljust(spec.n_bytes, "\x00"), 'utf-8')[:spec.n_bytes]
+    if isinstance(data, (int, float)) and not isinstance(data, str):
+        if not spec.in_limits(data):
+            raise ValueError(f"Value for {spec.name} out of limits")
+        return encode_word(data)
+    raise ValueError(f"Value for {spec.name} incorrect")
+
+
+@lru_cache(maxsize=MEMWRITE_CACHE_SIZE, typed=True)
+def _encode_memwrite(param: str, data: str | float) -> bytes:
+    """Encode a MEMWRITE frame, raising ValueError for invalid values."""
+    spec = PARAMS[param]
+    if spec.mem_id > MAX_MEMORY_ID or spec.is_group:
+        raise ValueError("Unknown frame type to encode: MEMWRITE")
+    return build_frame("MEMWRITE", spec.address + encode_value(spec, data))
+
+
+def encode_memwrites(values: dict[str, Any]) -> list[tuple[tuple[int, int, int], bytes]]:
+    """Encode values into the fewest MEMWRITE frames covering contiguous memory."""
+    # Every value is validated before anything is encoded, returns (id, offset, size) and frame
+    specs: list[tuple[SVSParam, bytes]] = []
+    for param, data in values.items():
+        spec = PARAMS.get(param)
+        if spec is None or spec.mem_id > MAX_MEMORY_ID or spec.is_group:
+            raise ValueError(f"Parameter {param} can't be written")
+        specs.append((spec, encode_value(spec, data)))
+    specs.sort(key=lambda item: (item[0].mem_id, item[0].offset))
+
+    runs: list[tuple[int, int, bytearray]] = []
+    for spec, encoded_data in specs:
+        if runs and runs[-1][0] == spec.mem_id and runs[-1][1] + len(runs[-1][2]) == spec.offset:
+            runs[-1][2].extend(encoded_data)
+        else:
+            runs.append((spec.mem_id, spec.offset, bytearray(encoded_data)))
+
+    return [
+        (
+            (mem_id, offset, len(payload)),
+            build_frame(
+                "MEMWRITE",
+                mem_id.to_bytes(4, "little")
+                + offset.to_bytes(2, "little")
+                + len(payload).to_bytes(2, "little")
+                + payload,
+            ),
+        )
+        for mem_id, offset, payload in runs
+    ]
+
+
+def svs_encode(ftype: str, param: str, data: Any = "") -> tuple[bytes, str]:
+    """Encode a frame for sending to the device."""
+    if param not in PARAMS:
+        _LOGGER.error("Unknown parameter to encode: %s", param)
+        return (b'', "")
+
+    if ftype == "MEMWRITE":
+        if not isinstance(data, (str, int, float)):
+            _LOGGER.error("Value for %s incorrect", param)
+            return (b'', "")
+        try:
+            frame = _encode_memwrite(param, data)
+        except ValueError as err:
+            _LOGGER.error("%s", err)
+            return (b'', "")
+    elif (frame := CONSTANT_FRAMES.get((ftype, param))) is None:
+        _LOGGER.error("Unknown frame type to encode: %s", ftype)
+        return (b'', "")
+
+    meta = f"{ftype} {[param]} {str(data) if data else ''}"
+    return (frame, meta)
+
+
+def svs_decode(frame: bytes) -> dict[str, Any]:
+    """Decode a frame received from the device."""
+    if len(frame) < 5:
+        return {"FRAME_RECOGNIZED": False}
+
+    # Validate frame
+    frame_length = int.from_bytes(frame[3:5], 'little')
+    recognized = (
+        frame[0] == PREAMBLE_BYTE and
+        frame_length == len(frame) and
+        frame[-2:] == crc_hqx(frame[:-2], 0).to_bytes(2, 'little')
+    )
+
+    if not recognized:
+        return {"FRAME_RECOGNIZED": False}
+    return svs_decode_verified(frame)
+
+
+def svs_decode_verified(frame: bytes) -> dict[str, Any]:
+    """Decode a frame whose preamble, length and CRC were already checked."""
+    output: dict[str, Any] = {"FRAME_RECOGNIZED": True}
+
+    frame_type = FRAME_TYPE_BY_CODE.get(bytes(frame[1:3]))
+    if not frame_type:
+        return output
+
+    output["FRAME_TYPE"] = frame_type
+    output["VALIDATED_VALUES"] = values = {}
+
+    if frame_type in SUB_INFO_FIELDS:
+        output["VALIDATED_VALUES"] = decode_sub_info(frame_type, bytes(frame[5:-2]))
+        return output
+
+    if frame_type not in ("MEMWRITE", "MEMREAD", "READ_RESP"):
+        return output
+
+    id_position = 9 if frame_type == "READ_RESP" else 5
+    mem_id = int.from_bytes(frame[id_position:id_position + 4], 'little')
+    mem_start = int.from_bytes(frame[id_position + 4:id_position + 6], 'little')
+    mem_size = int.from_bytes(frame[id_position + 6:id_position + 8], 'little')
+    output["MEMORY"] = (mem_id, mem_start, mem_size)
+
+    if frame_type == "MEMREAD":
+        return output
+
+    data_start = id_position + 8
+    layout = LAYOUTS.get((mem_id, mem_start, mem_size))
+    if layout is not None and data_start + mem_size <= len(frame) - 2:
+        output["VALIDATED_VALUES"] = layout.decode(frame, data_start)
+        return output
+
+    for position in range(mem_start, mem_start + mem_size, 2):
+        spec = PARAM_INDEX.get((mem_id, position))
+        if spec is None or spec.offset != position:
+            continue
+
+        data_bytes = frame[data_start + position - mem_start:data_start + position - mem_start + spec.n_bytes]
+        if spec.limits_type == 2:
+            # String type
+            values[spec.name] = bytes(data_bytes).decode("utf-8").rstrip('\x00')
+            continue
+
+        # Numeric type
+        value = decode_word(int.from_bytes(data_bytes, 'little'))
+        if spec.in_limits(value):
+            values[spec.name] = int(value) if value.is_integer() else value
+
+    return output
+
+
+class FrameReassembler:
+    """Reassemble frames from a stream of notification fragments."""
+
+    __slots__ = ("_buffer", "frames", "dropped_bytes", "crc_failures")
+
+    def __init__(self) -> None:
+        """Initialize the reassembler."""
+        self._buffer = bytearray()
+        self.frames = 0
+        self.dropped_bytes = 0
+        self.crc_failures = 0
+
+    @property
+    def pending(self) -> int:
+        """Return the number of buffered bytes not yet part of a frame."""
+        return len(self._buffer)
+
+    def reset(self) -> None:
+        """Discard any partially received frame."""
+        self._buffer.clear()
+
+    def feed(self, data: bytes | bytearray) -> list[bytes]:
+        """Add a fragment and return every frame completed by it."""
+        buffer = self._buffer
+        buffer += data
+        frames: list[bytes] = []
+        start = 0
+        end = len(buffer)
+
+        while start < end:
+            # Resync on the next preamble, anything before it is garbage
+            position = buffer.find(PREAMBLE_BYTE, start)
+            if position < 0:
+                self.dropped_bytes += end - start
+                start = end
+                break
+            self.dropped_bytes += position - start
+            start = position
+
+            if end - start < 5:
+                break
+            frame_length = buffer[start + 3] | buffer[start + 4] << 8
+            if not MIN_FRAME_LENGTH <= frame_length <= MAX_FRAME_LENGTH:
+                self.dropped_bytes += 1
+                start += 1
+                continue
+            if end - start < frame_length:
+                # Declared length not received yet
+                break
+
+            with memoryview(buffer) as view:
+                frame = view[start:start + frame_length]
+                crc = crc_hqx(frame[:-2], 0)
+                valid = frame[-2] | frame[-1] << 8 == crc
+                if valid:
+                    frames.append(frame.tobytes())
+                frame.release()
+
+            if valid:
+                self.frames += 1
+                start += frame_length
+            else:
+                self.crc_failures += 1
+                self.dropped_bytes += 1
+                start += 1
+
+        del buffer[:start]
+        return frames
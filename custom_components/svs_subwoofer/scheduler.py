@@ -0,0 +1,130 @@
+"""Command scheduler for SVS Subwoofer GATT operations."""
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable, Callable
+import heapq
+import itertools
+import logging
+import time
+from typing import Any, Final
+
+from bleak.exc import BleakError
+
+_LOGGER = logging.getLogger(__name__)
+
+# Lower values run first
+PRIORITY_USER: Final = 0
+PRIORITY_BACKGROUND: Final = 1
+
+
+class CommandCancelled(BleakError):
+    """Raised for a background command dropped in favor of a user command."""
+
+
+class SVSCommandScheduler:
+    """Run GATT commands of one device one at a time, user commands first."""
+
+    def __init__(self, name: str) -> None:
+        """Initialize the scheduler."""
+        self.name = name
+        self._queue: list[
+            tuple[int, int, float, Callable[[], Awaitable[Any]], asyncio.Future[Any]]
+        ] = []
+        self._sequence = itertools.count()
+        self._worker: asyncio.Task[None] | None = None
+        self.completed = 0
+        self.cancelled = 0
+        self._wait_total: dict[int, float] = {}
+        self._wait_max: dict[int, float] = {}
+        self._wait_count: dict[int, int] = {}
+
+    @property
+    def queue_depth(self) -> int:
+        """Return the number of commands waiting to run."""
+        return len(self._queue)
+
+    @property
+    def statistics(self) -> dict[str, Any]:
+        """Return queue depth and wait time statistics."""
+        return {
+            "queue_depth": self.queue_depth,
+            "completed": self.completed,
+            "cancelled": self.cancelled,
+            "wait": {
+                "user" if priority == PRIORITY_USER else "background": {
+                    "count": count,
+                    "mean": self._wait_total[priority] / count,
+                    "max": self._wait_max[priority],
+                }
+                for priority, count in self._wait_count.items()
+            },
+        }
+
+    async def run(
+        self,
+        command: Callable[[], Awaitable[Any]],
+        priority: int = PRIORITY_BACKGROUND,
+    ) -> Any:
+        """Queue a command and return its result once it has run."""
+        future: asyncio.Future[Any] = asyncio.get_running_loop().create_future()
+        heapq.heappush(
+            self._queue,
+            (priority, next(self._sequence), time.monotonic(), command, future),
+        )
+        if self._worker is None:
+            self._worker = asyncio.create_task(self._work())
+        return await future
+
+    def cancel_background(self) -> None:
+        """Drop queued background commands, they are stale."""
+        self._cancel(
+            lambda priority: priority > PRIORITY_USER,
+            CommandCancelled("Superseded by a user command"),
+        )
+
+    def cancel_all(self) -> None:
+        """Drop every queued command."""
+        self._cancel(lambda priority: True, BleakError("Command cancelled"))
+
+    def _cancel(self, match: Callable[[int], bool], err: BleakError) -> None:
+        """Fail the queued commands whose priority matches."""
+        keep = []
+        cancelled = 0
+        for item in self._queue:
+            if match(item[0]):
+                if not item[4].done():
+                    item[4].set_exception(err)
+                cancelled += 1
+            else:
+                keep.append(item)
+        heapq.heapify(keep)
+        self._queue = keep
+        if cancelled:
+            self.cancelled += cancelled
+            _LOGGER.debug("Cancelled %d queued commands for %s", cancelled, self.name)
+
+    async def _work(self) -> None:
+        """Run queued commands until the queue is empty."""
+        try:
+            while self._queue:
+                priority, _, queued_at, command, future = heapq.heappop(self._queue)
+                if future.done():
+                    continue
+
+                wait = time.monotonic() - queued_at
+                self._wait_count[priority] = self._wait_count.get(priority, 0) + 1
+                self._wait_total[priority] = self._wait_total.get(priority, 0.0) + wait
+                self._wait_max[priority] = max(self._wait_max.get(priority, 0.0), wait)
+
+                try:
+                    result = await command()
+                except Exception as err:  # noqa: BLE001
+                    if not future.done():
+                        future.set_exception(err)
+                else:
+                    if not future.done():
+                        future.set_result(result)
+                self.completed += 1
+        finally:
+            self._worker = None
@@ -2,16 +2,18 @@
 from __future__ import annotations
 
 import logging
+from typing import Any
 
 from homeassistant.components.select import SelectEntity
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import CONF_ADDRESS
 from homeassistant.core import HomeAssistant
+from homeassistant.helpers import entity_registry as er
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
-from .const import DOMAIN
+from .const import DOMAIN, SVS_PARAMS
 from .coordinator import SVSCoordinator
+from .entity import SVSEntity
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -23,38 +25,32 @@ async def async_setup_entry(
 ) -> None:
     """Set up SVS select entities from a config entry."""
     coordinator: SVSCoordinator = hass.data[DOMAIN][entry.entry_id]
-    async_add_entities([SVSStandbyModeSelect(coordinator, entry)])
-
-
-class SVSStandbyModeSelect(CoordinatorEntity[SVSCoordinator], SelectEntity):
+    entities: list[SelectEntity] = [SVSStandbyModeSelect(coordinator, entry)]
+    if coordinator.supports("PORTTUNING"):
+        entities.append(SVSPortTuningSelect(coordinator, entry))
+    else:
+        # Created before the model was known, the identity showed it is sealed
+        registry = er.async_get(hass)
+        if entity_id := registry.async_get_entity_id(
+            "select", DOMAIN, f"{entry.data[CONF_ADDRESS]}_port_tuning"
+        ):
+            registry.async_remove(entity_id)
+    async_add_entities(entities)
+
+
+class SVSStandbyModeSelect(SVSEntity, SelectEntity):
     """Representation of an SVS Subwoofer standby mode select."""
 
     _attr_has_entity_name = True
     _attr_name = "Standby Mode"
     _attr_options = ["Auto On", "Trigger", "On"]
     _attr_icon = "mdi:power-settings"
+    _svs_keys = ("STANDBY",)
 
     def __init__(self, coordinator: SVSCoordinator, entry: ConfigEntry) -> None:
         """Initialize the select entity."""
         super().__init__(coordinator)
         self._attr_unique_id = f"{entry.data[CONF_ADDRESS]}_standby_mode"
-        self._entry = entry
-
-    @property
-    def device_info(self):
-        """Return device info."""
-        return {
-            "identifiers": {(DOMAIN, self._entry.data[CONF_ADDRESS])},
-            "name": f"SVS Subwoofer {self._entry.data[CONF_ADDRESS][-5:]}",
-            "manufacturer": "SVS",
-            "model": "SB-1000 Pro",
-            "connections": {("bluetooth", self._entry.data[CONF_ADDRESS])},
-        }
-
-    @property
-    def available(self) -> bool:
-        """Return True if entity is available."""
-        return self.coordinator.device.is_connected and super().available
 
     @property
     def current_option(self) -> str | None:
@@ -71,6 +67,11 @@ class SVSStandbyModeSelect(CoordinatorEntity[SVSCoordinator], SelectEntity):
         }
         return mode_map.get(standby_value)
 
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Return additional state attributes."""
+        return {"stale": True} if self.coordinator.stale else {}
+
     async def async_select_option(self, option: str) -> None:
         """Change the selected standby mode."""
         # Map display string to numeric value
@@ -82,4 +83,37 @@ class SVSStandbyModeSelect(CoordinatorEntity[SVSCoordinator], SelectEntity):
 
         mode = option_map.get(option)
         if mode is not None:
-            await self.coordinator.device.set_standby(mode)
+            await self.coordinator.async_set_value("STANDBY", mode)
+
+
+class SVSPortTuningSelect(SVSEntity, SelectEntity):
+    """Representation of the port tuning of a ported SVS Subwoofer."""
+
+    _attr_has_entity_name = True
+    _attr_name = "Port Tuning"
+    _attr_icon = "mdi:tune-vertical"
+    _attr_options = [f"{value} Hz" for value in SVS_PARAMS["PORTTUNING"]["limits"]]
+    _svs_keys = ("PORTTUNING",)
+
+    def __init__(self, coordinator: SVSCoordinator, entry: ConfigEntry) -> None:
+        """Initialize the select entity."""
+        super().__init__(coordinator)
+        self._attr_unique_id = f"{entry.data[CONF_ADDRESS]}_port_tuning"
+
+    @property
+    def current_option(self) -> str | None:
+        """Return the current port tuning."""
+        value = self.coordinator.data.get("PORTTUNING")
+        if value is None:
+            return None
+        option = f"{value} Hz"
+        return option if option in self.options else None
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Return additional state attributes."""
+        return {"stale": True} if self.coordinator.stale else {}
+
+    async def async_select_option(self, option: str) -> None:
+        """Change the port tuning."""
+        await self.coordinator.async_set_value("PORTTUNING", int(option.removesuffix(" Hz")))
@@ -0,0 +1,169 @@
+"""Diagnostic sensor platform for SVS Subwoofer."""
+from __future__ import annotations
+
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import timedelta
+import logging
+
+from homeassistant.components.sensor import (
+    SensorEntity,
+    SensorEntityDescription,
+    SensorStateClass,
+)
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import (
+    CONF_ADDRESS,
+    PERCENTAGE,
+    EntityCategory,
+    UnitOfTime,
+)
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.typing import StateType
+
+from .const import DOMAIN
+from .coordinator import SVSCoordinator
+from .entity import SVSEntity
+
+_LOGGER = logging.getLogger(__name__)
+
+# Telemetry changes without any state change, the sensors are refreshed on this interval
+SCAN_INTERVAL = timedelta(seconds=60)
+
+
+def _round(value: float | None, digits: int = 1) -> float | None:
+    """Round a value that may be missing."""
+    return None if value is None else round(value, digits)
+
+
+def _queue_wait(coordinator: SVSCoordinator) -> float | None:
+    """Return the mean time commands waited in the queue in milliseconds."""
+    waits = coordinator.device.scheduler.statistics["wait"].values()
+    count = sum(wait["count"] for wait in waits)
+    if not count:
+        return None
+    return round(sum(wait["mean"] * wait["count"] for wait in waits) / count * 1000, 1)
+
+
+@dataclass(frozen=True, kw_only=True)
+class SVSSensorEntityDescription(SensorEntityDescription):
+    """Describes an SVS telemetry sensor."""
+
+    value_fn: Callable[[SVSCoordinator], StateType]
+
+
+SENSORS: tuple[SVSSensorEntityDescription, ...] = (
+    SVSSensorEntityDescription(
+        key="round_trip",
+        name="Command round trip",
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda coordinator: _round(
+            coordinator.device.telemetry.all_round_trips.mean
+        ),
+    ),
+    SVSSensorEntityDescription(
+        key="notification_rate",
+        name="Notifications per second",
+        native_unit_of_measurement="notifications/s",
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda coordinator: round(
+            coordinator.device.telemetry.notification_rate, 2
+        ),
+    ),
+    SVSSensorEntityDescription(
+        key="fragments_per_frame",
+        name="Fragments per frame",
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda coordinator: _round(
+            coordinator.device.telemetry.fragments_per_frame, 2
+        ),
+    ),
+    SVSSensorEntityDescription(
+        key="crc_failures",
+        name="CRC failures",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda coordinator: coordinator.device.statistics["crc_failures"],
+    ),
+    SVSSensorEntityDescription(
+        key="out_of_sync",
+        name="Out of sync fragments",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda coordinator: coordinator.device.telemetry.out_of_sync,
+    ),
+    SVSSensorEntityDescription(
+        key="reconnects",
+        name="Reconnects",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda coordinator: coordinator.connection.reconnects,
+    ),
+    SVSSensorEntityDescription(
+        key="connected_ratio",
+        name="Connected time",
+        native_unit_of_measurement=PERCENTAGE,
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda coordinator: round(
+            coordinator.device.telemetry.connected_ratio * 100, 1
+        ),
+    ),
+    SVSSensorEntityDescription(
+        key="queue_wait",
+        name="Queue wait",
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=_queue_wait,
+    ),
+)
+
+
+async def async_setup_entry(
+    hass: HomeAssistant,
+    entry: ConfigEntry,
+    async_add_entities: AddEntitiesCallback,
+) -> None:
+    """Set up SVS telemetry sensors from a config entry."""
+    coordinator: SVSCoordinator = hass.data[DOMAIN][entry.entry_id]
+    async_add_entities(
+        SVSTelemetrySensor(coordinator, entry, description) for description in SENSORS
+    )
+
+
+class SVSTelemetrySensor(SVSEntity, SensorEntity):
+    """Diagnostic sensor reporting the performance of the subwoofer link."""
+
+    entity_description: SVSSensorEntityDescription
+
+    _attr_has_entity_name = True
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_entity_registry_enabled_default = False
+
+    def __init__(
+        self,
+        coordinator: SVSCoordinator,
+        entry: ConfigEntry,
+        description: SVSSensorEntityDescription,
+    ) -> None:
+        """Initialize the sensor."""
+        super().__init__(coordinator)
+        self.entity_description = description
+        self._attr_unique_id = f"{entry.data[CONF_ADDRESS]}_{description.key}"
+
+    @property
+    def should_poll(self) -> bool:
+        """Return True, telemetry is sampled on SCAN_INTERVAL, not pushed by state changes."""
+        # CoordinatorEntity defines should_poll as a property, an attribute does not override it
+        return True
+
+    @property
+    def available(self) -> bool:
+        """Return True, telemetry is most useful while the link is down."""
+        return True
+
+    @property
+    def native_value(self) -> StateType:
+        """Return the telemetry value."""
+        return self.entity_description.value_fn(self.coordinator)
+
+    async def async_update(self) -> None:
+        """Sample the telemetry without refreshing the coordinator."""
@@ -0,0 +1,261 @@
+"""Services for SVS Subwoofer."""
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from typing import Any
+
+import voluptuous as vol
+
+from homeassistant.const import ATTR_ENTITY_ID
+from homeassistant.core import (
+    HomeAssistant,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
+)
+from homeassistant.exceptions import HomeAssistantError, ServiceValidationError
+from homeassistant.helpers import config_validation as cv, entity_registry as er
+
+from .const import DOMAIN, STANDBY_MODES
+from .coordinator import SVSCoordinator
+from .protocol import PARAMS
+
+_LOGGER = logging.getLogger(__name__)
+
+SERVICE_GROUP_SET = "group_set"
+SERVICE_SAVE_PRESET = "save_preset"
+SERVICE_APPLY_PRESET = "apply_preset"
+SERVICE_DELETE_PRESET = "delete_preset"
+SERVICE_DEVICE_PRESET = "device_preset"
+
+ATTR_VOLUME = "volume"
+ATTR_PHASE = "phase"
+ATTR_STANDBY = "standby"
+ATTR_OFFSETS = "offsets"
+ATTR_NAME = "name"
+ATTR_ACTION = "action"
+ATTR_SLOT = "slot"
+
+DEVICE_PRESET_ACTIONS = {"load": "LOAD", "save": "SAVE"}
+
+STANDBY_VALUES = {name: value for value, name in STANDBY_MODES.items()}
+
+GROUP_SET_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_ENTITY_ID): cv.entity_ids,
+        vol.Optional(ATTR_VOLUME): vol.All(vol.Coerce(int), vol.Range(min=-60, max=0)),
+        vol.Optional(ATTR_PHASE): vol.All(vol.Coerce(int), vol.Range(min=0, max=180)),
+        vol.Optional(ATTR_STANDBY): vol.In(STANDBY_VALUES),
+        # Per member trims added to the group value, keyed on entity id
+        vol.Optional(ATTR_OFFSETS, default={}): {
+            cv.entity_id: {
+                vol.Optional(ATTR_VOLUME, default=0): vol.Coerce(int),
+                vol.Optional(ATTR_PHASE, default=0): vol.Coerce(int),
+            }
+        },
+    }
+)
+
+PRESET_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_ENTITY_ID): cv.entity_ids,
+        vol.Required(ATTR_NAME): vol.All(cv.string, vol.Strip, vol.Length(min=1)),
+    }
+)
+
+DEVICE_PRESET_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_ENTITY_ID): cv.entity_ids,
+        vol.Required(ATTR_ACTION): vol.In(DEVICE_PRESET_ACTIONS),
+        vol.Required(ATTR_SLOT): vol.All(vol.Coerce(int), vol.Range(min=1, max=3)),
+    }
+)
+
+
+def _clamp(param: str, value: int) -> int:
+    """Clamp a value into the limits of a range parameter."""
+    spec = PARAMS[param]
+    return int(min(max(value, spec.low), spec.high))
+
+
+def _coordinators(hass: HomeAssistant, call: ServiceCall) -> dict[str, SVSCoordinator]:
+    """Return the coordinator of every subwoofer a call targets, keyed on entity id."""
+    registry = er.async_get(hass)
+    coordinators: dict[str, SVSCoordinator] = {}
+    for entity_id in call.data[ATTR_ENTITY_ID]:
+        entity = registry.async_get(entity_id)
+        if (
+            entity is None
+            or entity.platform != DOMAIN
+            or entity.config_entry_id not in hass.data.get(DOMAIN, {})
+        ):
+            raise ServiceValidationError(f"{entity_id} is not a loaded SVS Subwoofer")
+        coordinator = hass.data[DOMAIN][entity.config_entry_id]
+        # Several entities of one subwoofer are written once, under the first one
+        if coordinator not in coordinators.values():
+            coordinators[entity_id] = coordinator
+    return coordinators
+
+
+async def _async_group_set(hass: HomeAssistant, call: ServiceCall) -> ServiceResponse:
+    """Write the same settings to several subwoofers at once."""
+    coordinators = _coordinators(hass, call)
+
+    async def _async_set_member(entity_id: str) -> dict[str, Any]:
+        """Apply the settings to one member and time it."""
+        coordinator = coordinators[entity_id]
+        offsets = call.data[ATTR_OFFSETS].get(entity_id, {})
+        values: dict[str, int] = {}
+        if ATTR_VOLUME in call.data:
+            values["VOLUME"] = _clamp(
+                "VOLUME", call.data[ATTR_VOLUME] + offsets.get(ATTR_VOLUME, 0)
+            )
+        if ATTR_PHASE in call.data:
+            values["PHASE"] = _clamp(
+                "PHASE", call.data[ATTR_PHASE] + offsets.get(ATTR_PHASE, 0)
+            )
+        if ATTR_STANDBY in call.data:
+            values["STANDBY"] = STANDBY_VALUES[call.data[ATTR_STANDBY]]
+
+        start = time.monotonic()
+        try:
+            # Volume and phase are adjacent in memory and share one frame
+            await coordinator.async_set_values(values)
+        except HomeAssistantError as err:
+            _LOGGER.warning("Could not update %s: %s", entity_id, err)
+            return {
+                "success": False,
+                "latency": round(time.monotonic() - start, 3),
+                "error": str(err),
+            }
+        return {
+            "success": True,
+            "latency": round(time.monotonic() - start, 3),
+            "values": values,
+        }
+
+    results = await asyncio.gather(
+        *(_async_set_member(entity_id) for entity_id in coordinators)
+    )
+    return {"members": dict(zip(coordinators, results))}
+
+
+async def _async_save_preset(hass: HomeAssistant, call: ServiceCall) -> None:
+    """Store the current settings of each subwoofer under a name."""
+    name = call.data[ATTR_NAME]
+    for entity_id, coordinator in _coordinators(hass, call).items():
+        if not (snapshot := coordinator.snapshot()):
+            raise ServiceValidationError(f"Settings of {entity_id} have not been read yet")
+        await coordinator.presets.async_save(name, snapshot)
+
+
+async def _async_apply_preset(hass: HomeAssistant, call: ServiceCall) -> ServiceResponse:
+    """Write the settings of a stored preset that differ from each subwoofer."""
+    name = call.data[ATTR_NAME]
+    coordinators = _coordinators(hass, call)
+    snapshots = {}
+    for entity_id, coordinator in coordinators.items():
+        if (snapshot := coordinator.presets.get(name)) is None:
+            raise ServiceValidationError(f"{entity_id} has no preset named {name}")
+        coordinator.validate_snapshot(snapshot)
+        snapshots[entity_id] = snapshot
+
+    async def _async_apply_member(entity_id: str) -> dict[str, Any]:
+        """Apply the preset to one member and time it."""
+        start = time.monotonic()
+        try:
+            values = await coordinators[entity_id].async_apply_snapshot(snapshots[entity_id])
+        except HomeAssistantError as err:
+            _LOGGER.warning("Could not apply preset %s to %s: %s", name, entity_id, err)
+            return {
+                "success": False,
+                "latency": round(time.monotonic() - start, 3),
+                "error": str(err),
+            }
+        return {
+            "success": True,
+            "latency": round(time.monotonic() - start, 3),
+            "changed": values,
+        }
+
+    results = await asyncio.gather(
+        *(_async_apply_member(entity_id) for entity_id in coordinators)
+    )
+    return {"members": dict(zip(coordinators, results))}
+
+
+async def _async_delete_preset(hass: HomeAssistant, call: ServiceCall) -> None:
+    """Remove a stored preset."""
+    name = call.data[ATTR_NAME]
+    for coordinator in _coordinators(hass, call).values():
+        await coordinator.presets.async_delete(name)
+
+
+async def _async_device_preset(hass: HomeAssistant, call: ServiceCall) -> None:
+    """Load or save one of the preset slots kept on each subwoofer."""
+    param = f"PRESET{call.data[ATTR_SLOT]}{DEVICE_PRESET_ACTIONS[call.data[ATTR_ACTION]]}"
+    await asyncio.gather(
+        *(
+            coordinator.async_device_preset(param)
+            for coordinator in _coordinators(hass, call).values()
+        )
+    )
+
+
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Register the SVS Subwoofer services."""
+
+    async def _async_handle_group_set(call: ServiceCall) -> ServiceResponse:
+        """Handle the group_set service call."""
+        return await _async_group_set(hass, call)
+
+    async def _async_handle_save_preset(call: ServiceCall) -> None:
+        """Handle the save_preset service call."""
+        await _async_save_preset(hass, call)
+
+    async def _async_handle_apply_preset(call: ServiceCall) -> ServiceResponse:
+        """Handle the apply_preset service call."""
+        return await _async_apply_preset(hass, call)
+
+    async def _async_handle_delete_preset(call: ServiceCall) -> None:
+        """Handle the delete_preset service call."""
+        await _async_delete_preset(hass, call)
+
+    async def _async_handle_device_preset(call: ServiceCall) -> None:
+        """Handle the device_preset service call."""
+        await _async_device_preset(hass, call)
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_GROUP_SET,
+        _async_handle_group_set,
+        schema=GROUP_SET_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_SAVE_PRESET,
+        _async_handle_save_preset,
+        schema=PRESET_SCHEMA,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_APPLY_PRESET,
+        _async_handle_apply_preset,
+        schema=PRESET_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_DELETE_PRESET,
+        _async_handle_delete_preset,
+        schema=PRESET_SCHEMA,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_DEVICE_PRESET,
+        _async_handle_device_preset,
+        schema=DEVICE_PRESET_SCHEMA,
+    )
@@ -0,0 +1,80 @@
+"""Bluetooth connection slot sharing for SVS Subwoofer."""
+from __future__ import annotations
+
+import asyncio
+import heapq
+import itertools
+import logging
+
+from .const import SLOTS_PER_SOURCE
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class SVSSlotManager:
+    """Share the connection slots of each adapter or proxy between subwoofers."""
+
+    def __init__(self, slots_per_source: int = SLOTS_PER_SOURCE) -> None:
+        """Initialize the slot manager."""
+        self.slots_per_source = slots_per_source
+        self._holders: dict[str, set[str]] = {}
+        # Heap per source of (priority, arrival, address, future), lowest first
+        self._waiters: dict[str, list[tuple[int, int, str, asyncio.Future[None]]]] = {}
+        self._sequence = itertools.count()
+
+    def holders(self, source: str) -> set[str]:
+        """Return the addresses holding a slot of a source."""
+        return set(self._holders.get(source, ()))
+
+    def has_waiters(self, source: str) -> bool:
+        """Return True if a subwoofer is waiting for a slot of a source."""
+        return any(not item[3].done() for item in self._waiters.get(source, ()))
+
+    async def acquire(self, source: str, address: str, priority: int) -> None:
+        """Wait for a slot of a source, lower priority values are served first."""
+        holders = self._holders.setdefault(source, set())
+        if address in holders:
+            return
+        if len(holders) < self.slots_per_source and not self.has_waiters(source):
+            holders.add(address)
+            return
+
+        future: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        heapq.heappush(
+            self._waiters.setdefault(source, []),
+            (priority, next(self._sequence), address, future),
+        )
+        _LOGGER.debug("%s waiting for a connection slot on %s", address, source)
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # Granted while being cancelled, pass the slot on
+                self.release(source, address)
+            raise
+
+    def release(self, source: str, address: str) -> None:
+        """Give a slot back and hand it to the next waiter."""
+        holders = self._holders.get(source)
+        if holders is None or address not in holders:
+            return
+        holders.discard(address)
+
+        waiters = self._waiters.get(source, [])
+        while waiters and len(holders) < self.slots_per_source:
+            _, _, waiter, future = heapq.heappop(waiters)
+            if future.done():
+                continue
+            holders.add(waiter)
+            # Every caller of that subwoofer waiting, at any priority, shares the slot
+            for item in waiters:
+                if item[2] == waiter and not item[3].done():
+                    item[3].set_result(None)
+            future.set_result(None)
+            _LOGGER.debug("Connection slot on %s handed to %s", source, waiter)
+
+    def move(self, source: str, new_source: str, address: str) -> None:
+        """Charge a held slot to the adapter or proxy the connection really uses."""
+        self.release(source, address)
+        # The connection exists, it counts even if that source was full
+        self._holders.setdefault(new_source, set()).add(address)
@@ -0,0 +1,194 @@
+"""Link and command performance telemetry for SVS Subwoofer."""
+from __future__ import annotations
+
+from bisect import bisect_left
+import time
+from typing import Any, Final
+
+from .const import NOTIFICATION_RATE_WINDOW
+
+# Upper bounds of the round trip histogram buckets in milliseconds, the last one is open
+ROUND_TRIP_BUCKETS: Final = (10, 25, 50, 100, 250, 500, 1000, 2000)
+
+
+class Histogram:
+    """Bucketed distribution of durations in milliseconds."""
+
+    __slots__ = ("bounds", "counts", "count", "total", "max")
+
+    def __init__(self, bounds: tuple[float, ...] = ROUND_TRIP_BUCKETS) -> None:
+        """Initialize an empty histogram."""
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def record(self, value: float) -> None:
+        """Add a value."""
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.total += value
+        if value > self.max:
+            self.max = value
+
+    @property
+    def mean(self) -> float | None:
+        """Return the mean value, None if empty."""
+        return self.total / self.count if self.count else None
+
+    def percentile(self, fraction: float) -> float | None:
+        """Return the upper bound of the bucket holding a percentile, None if empty."""
+        if not self.count:
+            return None
+        rank = fraction * self.count
+        seen = 0
+        for bound, count in zip(self.bounds, self.counts):
+            seen += count
+            if seen >= rank:
+                return min(bound, self.max)
+        return self.max
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the histogram for diagnostics."""
+        labels = [f"<={bound}" for bound in self.bounds] + [f">{self.bounds[-1]}"]
+        return {
+            "count": self.count,
+            "mean": None if self.mean is None else round(self.mean, 1),
+            "p50": self.percentile(0.5),
+            "p90": self.percentile(0.9),
+            "max": round(self.max, 1),
+            "buckets": dict(zip(labels, self.counts)),
+        }
+
+
+class SVSTelemetry:
+    """Counters and distributions describing how well a subwoofer link performs."""
+
+    def __init__(self) -> None:
+        """Initialize the telemetry."""
+        self.started = time.monotonic()
+        # Round trip per request frame type, from the write to the matching response
+        self.round_trips: dict[str, Histogram] = {}
+        self.all_round_trips = Histogram()
+        self.timeouts: dict[str, int] = {}
+        self.notifications = 0
+        # Notification rate of the last complete window, and the window in progress
+        self._rate = 0.0
+        self._rate_start = self.started
+        self._rate_count = 0
+        # Number of notifications a frame arrived in -> frames
+        self.fragments: dict[int, int] = {}
+        # Frame type -> [frames, notifications they arrived in]
+        self.fragments_by_type: dict[str, list[int]] = {}
+        self._fragments = 0
+        # Negotiated ATT MTU, and frames written in more than one piece
+        self.mtu = 0
+        self.split_writes = 0
+        self.out_of_sync = 0
+        self.connects = 0
+        self._connected_since: float | None = None
+        self._connected_total = 0.0
+        self.polls = Histogram()
+        self.poll_failures = 0
+
+    def record_round_trip(self, ftype: str, seconds: float) -> None:
+        """Record the time a request took to be answered."""
+        milliseconds = seconds * 1000
+        if (histogram := self.round_trips.get(ftype)) is None:
+            histogram = self.round_trips[ftype] = Histogram()
+        histogram.record(milliseconds)
+        self.all_round_trips.record(milliseconds)
+
+    def record_timeout(self, ftype: str) -> None:
+        """Record a request that was not answered in time."""
+        self.timeouts[ftype] = self.timeouts.get(ftype, 0) + 1
+
+    def record_notification(self, now: float, starts_frame: bool) -> None:
+        """Record a notification, starts_frame if nothing was buffered before it."""
+        self.notifications += 1
+        if now - self._rate_start >= NOTIFICATION_RATE_WINDOW:
+            self._roll_rate(now)
+        self._fragments = 1 if starts_frame else self._fragments + 1
+
+    def record_frame(self, ftype: str) -> None:
+        """Record a frame completed by the last notification."""
+        fragments = self._fragments
+        self.fragments[fragments] = self.fragments.get(fragments, 0) + 1
+        if (by_type := self.fragments_by_type.get(ftype)) is None:
+            by_type = self.fragments_by_type[ftype] = [0, 0]
+        by_type[0] += 1
+        by_type[1] += fragments
+        # Anything after it in the same notification starts the next frame
+        self._fragments = 1
+
+    def record_connected(self) -> None:
+        """Record the link coming up."""
+        self.connects += 1
+        self._connected_since = time.monotonic()
+        self._fragments = 0
+
+    def record_disconnected(self) -> None:
+        """Record the link going down."""
+        if self._connected_since is not None:
+            self._connected_total += time.monotonic() - self._connected_since
+            self._connected_since = None
+
+    def record_poll(self, seconds: float) -> None:
+        """Record the duration of a successful coordinator poll."""
+        self.polls.record(seconds * 1000)
+
+    def _roll_rate(self, now: float) -> None:
+        """Close the rate window in progress and start a new one."""
+        self._rate = (self.notifications - self._rate_count) / (now - self._rate_start)
+        self._rate_start = now
+        self._rate_count = self.notifications
+
+    @property
+    def notification_rate(self) -> float:
+        """Return notifications per second over the last complete rate window."""
+        now = time.monotonic()
+        if now - self._rate_start >= NOTIFICATION_RATE_WINDOW:
+            self._roll_rate(now)
+        return self._rate
+
+    @property
+    def fragments_per_frame(self) -> float | None:
+        """Return the mean number of notifications per frame, None before any frame."""
+        frames = sum(self.fragments.values())
+        if not frames:
+            return None
+        return sum(fragments * count for fragments, count in self.fragments.items()) / frames
+
+    @property
+    def connected_ratio(self) -> float:
+        """Return the share of time the link was up since startup."""
+        now = time.monotonic()
+        connected = self._connected_total
+        if self._connected_since is not None:
+            connected += now - self._connected_since
+        elapsed = now - self.started
+        return connected / elapsed if elapsed > 0 else 0.0
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the telemetry for diagnostics."""
+        return {
+            "round_trips_ms": {
+                ftype: histogram.as_dict() for ftype, histogram in self.round_trips.items()
+            },
+            "timeouts": dict(self.timeouts),
+            "notifications": self.notifications,
+            "notifications_per_sec": round(self.notification_rate, 3),
+            "fragments_per_frame": dict(sorted(self.fragments.items())),
+            "fragments_per_frame_type": {
+                ftype: round(fragments / frames, 2)
+                for ftype, (frames, fragments) in self.fragments_by_type.items()
+            },
+            "mtu": self.mtu,
+            "split_writes": self.split_writes,
+            "out_of_sync": self.out_of_sync,
+            "connects": self.connects,
+            "connected_ratio": round(self.connected_ratio, 4),
+            "polls_ms": self.polls.as_dict(),
+            "poll_failures": self.poll_failures,
+        }
@@ -0,0 +1 @@
+"""Tests for the SVS Subwoofer integration."""
@@ -0,0 +1,85 @@
+"""Tests for the SVS frame codec and notification reassembly."""
+from __future__ import annotations
+
+import pytest
+
+from benchmarks.corpus import build_corpus
+from custom_components.svs_subwoofer.protocol import (
+    MAX_FRAME_LENGTH,
+    PARAMS,
+    FrameReassembler,
+    build_frame,
+    svs_decode,
+)
+
+VOLUME_FRAME = build_frame("READ_RESP", bytes(4) + PARAMS["VOLUME"].address + b"\x9c\xff")
+PHASE_FRAME = build_frame("READ_RESP", bytes(4) + PARAMS["PHASE"].address + b"\x08\x07")
+
+
+def _feed(reassembler: FrameReassembler, fragments: list[bytes]) -> list[bytes]:
+    """Feed fragments in order and return every completed frame."""
+    return [frame for fragment in fragments for frame in reassembler.feed(fragment)]
+
+
+@pytest.mark.parametrize("stream", ["valid", "fragmented", "concatenated", "corrupted"])
+def test_corpus_frames_come_back_out(stream: str) -> None:
+    """Test every valid corpus frame is returned unchanged and in order."""
+    corpus = build_corpus()
+    reassembler = FrameReassembler()
+
+    assert _feed(reassembler, corpus.streams[stream]) == corpus.frames
+    assert reassembler.frames == len(corpus.frames)
+    assert reassembler.pending < MAX_FRAME_LENGTH
+
+
+def test_frames_split_across_notifications() -> None:
+    """Test back to back frames cut at every position are reassembled."""
+    stream = VOLUME_FRAME + PHASE_FRAME
+    for cut in range(1, len(stream)):
+        reassembler = FrameReassembler()
+        assert _feed(reassembler, [stream[:cut], stream[cut:]]) == [
+            VOLUME_FRAME,
+            PHASE_FRAME,
+        ]
+        assert reassembler.pending == 0
+
+
+def test_resync_after_line_noise() -> None:
+    """Test bytes before the preamble are dropped and counted."""
+    reassembler = FrameReassembler()
+
+    assert reassembler.feed(b"\x01\x02\x03" + VOLUME_FRAME) == [VOLUME_FRAME]
+    assert reassembler.dropped_bytes == 3
+    assert svs_decode(VOLUME_FRAME)["VALIDATED_VALUES"] == {"VOLUME": -10}
+
+
+def test_resync_after_crc_failure() -> None:
+    """Test a damaged frame is skipped without losing the frame after it."""
+    damaged = bytearray(VOLUME_FRAME)
+    damaged[-3] ^= 0xFF
+    reassembler = FrameReassembler()
+
+    assert _feed(reassembler, [bytes(damaged), PHASE_FRAME]) == [PHASE_FRAME]
+    assert reassembler.crc_failures == 1
+
+
+def test_corrupt_length_does_not_hold_back_frames() -> None:
+    """Test a length header longer than any frame is skipped at once."""
+    assert MAX_FRAME_LENGTH < 0xFF
+    header = VOLUME_FRAME[:3] + (0xFF).to_bytes(2, "little")
+    reassembler = FrameReassembler()
+
+    assert reassembler.feed(header) == []
+    assert reassembler.feed(PHASE_FRAME) == [PHASE_FRAME]
+    assert reassembler.pending == 0
+
+
+def test_max_frame_length_fits_largest_read() -> None:
+    """Test the length bound fits the answer to a full settings read."""
+    full_settings = PARAMS["FULL_SETTINGS"]
+    frame = build_frame(
+        "READ_RESP", bytes(4) + full_settings.address + bytes(full_settings.n_bytes)
+    )
+
+    assert len(frame) == MAX_FRAME_LENGTH
+    assert FrameReassembler().feed(frame) == [frame]
@@ -0,0 +1,113 @@
+"""Tests for sharing Bluetooth connection slots between subwoofers."""
+from __future__ import annotations
+
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+from bleak.exc import BleakError
+import pytest
+
+from custom_components.svs_subwoofer.connection import SVSConnectionManager
+from custom_components.svs_subwoofer.slots import SVSSlotManager
+
+SOURCE = "proxy"
+
+
+async def _settle() -> None:
+    """Let every ready task run until it waits again."""
+    for _ in range(10):
+        await asyncio.sleep(0)
+
+
+def test_waiters_served_by_priority() -> None:
+    """Test a freed slot goes to the waiter with the lowest priority value."""
+
+    async def run() -> None:
+        slots = SVSSlotManager(slots_per_source=1)
+        await slots.acquire(SOURCE, "A", 1)
+        background = asyncio.create_task(slots.acquire(SOURCE, "B", 1))
+        user = asyncio.create_task(slots.acquire(SOURCE, "C", 0))
+        await _settle()
+        assert slots.has_waiters(SOURCE)
+
+        slots.release(SOURCE, "A")
+        await _settle()
+        assert user.done() and not background.done()
+        assert slots.holders(SOURCE) == {"C"}
+
+        slots.release(SOURCE, "C")
+        await _settle()
+        assert background.done()
+        assert slots.holders(SOURCE) == {"B"}
+        assert not slots.has_waiters(SOURCE)
+
+    asyncio.run(run())
+
+
+def test_release_wakes_every_caller_of_an_address() -> None:
+    """Test callers of one subwoofer waiting at different priorities share a grant."""
+
+    async def run() -> None:
+        slots = SVSSlotManager(slots_per_source=1)
+        await slots.acquire(SOURCE, "A", 1)
+        first = asyncio.create_task(slots.acquire(SOURCE, "B", 0))
+        second = asyncio.create_task(slots.acquire(SOURCE, "B", 1))
+        await _settle()
+
+        slots.release(SOURCE, "A")
+        await _settle()
+        assert first.done() and second.done()
+        assert slots.holders(SOURCE) == {"B"}
+
+    asyncio.run(run())
+
+
+def test_shared_slot_not_reused_after_failed_connect() -> None:
+    """Test a caller sharing a slot that was given back waits for a new one."""
+
+    async def run() -> None:
+        slots = SVSSlotManager(slots_per_source=1)
+        device = MagicMock(address="A", is_connected=False, source=None)
+        holders_at_connect: list[set[str]] = []
+
+        async def connect(ble_device: object) -> None:
+            holders_at_connect.append(slots.holders(SOURCE))
+            await asyncio.sleep(0)
+            if len(holders_at_connect) == 1:
+                raise BleakError("Connection failed")
+            device.is_connected = True
+
+        device.connect = connect
+        manager = SVSConnectionManager(MagicMock(), device, slots)
+
+        with patch(
+            "custom_components.svs_subwoofer.connection.bluetooth"
+        ) as bluetooth:
+            bluetooth.async_last_service_info.return_value = SimpleNamespace(
+                source=SOURCE
+            )
+            bluetooth.async_ble_device_from_address.return_value = object()
+
+            # A reconnect takes the slot, a poll for the same subwoofer shares
+            # it, and another subwoofer queues for the slot
+            reconnect = asyncio.create_task(manager.ensure_connected())
+            poll = asyncio.create_task(manager.ensure_connected())
+            other = asyncio.create_task(slots.acquire(SOURCE, "B", 1))
+            await _settle()
+
+            # The failed connect handed the slot to the other subwoofer, the
+            # poll must not connect without one
+            with pytest.raises(BleakError):
+                await reconnect
+            assert other.done()
+            assert not poll.done()
+            assert len(holders_at_connect) == 1
+            assert slots.holders(SOURCE) == {"B"}
+
+            slots.release(SOURCE, "B")
+            await poll
+            assert holders_at_connect[1] == {"A"}
+            assert slots.holders(SOURCE) == {"A"}
+
+    asyncio.run(run())